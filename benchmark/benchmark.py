@@ -8,18 +8,140 @@ The evaluation uses a curated dataset with ground truth labels and measures
 classification metrics including accuracy, precision, recall, and F1-score.
 """
 
+import argparse
+import asyncio
+import hashlib
 import json
+import logging
 import os
+import re
+import sqlite3
 from datetime import datetime
-from typing import Dict, List, Tuple
-from openai import OpenAI
+from typing import Dict, List, Optional, Tuple, Union
+
+import httpx
+import numpy as np
+from openai import APIConnectionError, AsyncOpenAI, InternalServerError, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+from tqdm.asyncio import tqdm_asyncio
+from tqdm.contrib.logging import logging_redirect_tqdm
 from dotenv import load_dotenv
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, stdlib json accepts bytes too
+    from json import loads as json_loads
+
 # Load environment variables from project root
 env_path = Path(__file__).parent.parent / '.env'
 load_dotenv(env_path)
 
+logger = logging.getLogger("benchmark")
+
+# Transient OpenRouter failures that are worth retrying instead of counting as ERROR
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, InternalServerError)
+
+# Static part of the astro analysis prompt. It is sent as the system message and
+# goes first, so the provider can reuse its cached prefix across all samples.
+SYSTEM_PROMPT = """Ты — профессиональный астролог. На основе предоставленного астрологического контекста дай краткий совет о планируемом событии.
+
+ЗАДАЧА:
+Проанализируй благоприятность этого времени для запланированного события на основе астрологического контекста.
+
+Твой ответ должен быть:
+1. Кратким (2-4 предложения)
+2. Конкретным (относиться именно к этому событию и времени)
+3. Практичным (давать конкретные рекомендации)
+4. Основанным на предоставленном астрологическом контексте
+5. Дружелюбным и понятным (избегай сложных астрологических терминов, пиши простым языком)
+6. Позитивным и поддерживающим (даже если время не идеально)
+7. Если время не подходит, то обязательно предложи другое время или дату
+
+Не повторяй информацию о событии, сразу переходи к астрологическому анализу.
+
+Всегда стремись найти позитивные аспекты и считать время скорее подходящим, если контекст не указывает на явные риски. 
+
+
+Верни ответ в формате JSON со следующей структурой:
+{
+    "result": "OK/BAD",
+    "message": "Астрологические рекомендации"
+}
+result может быть только OK или BAD, если время подходит, то OK, если нет, то BAD
+message может быть пустым
+
+Примеры:
+- {"result": "OK", "message": "Астрологический совет: это хорошее время для этого события"}
+- {"result": "BAD", "message": "Согласно гороскопу, неделя с 3 по 9 ноября 2025 года для знака Водолей не описана,
+    но для знака Скорпион эта неделя — время мудрости и заботы о себе, рекомендуется слушать своё сердце и не усложнять задачи.
+    Это может говорить о том, что сейчас не самое благоприятное время для важных встреч, требующих концентрации и принятия решений.
+    Напутствие: попробуйте перенести встречу на более благоприятное время, например, на следующую неделю."}
+- {"result": "OK", "message": "Астрологический совет: Завтрашние транзиты выглядят спокойными — даже если день в целом кажется энергически неровным, в вашей личной конфигурации нет напряжённых аспектов, которые могли бы помешать встрече. Влияние планет скорее нейтральное, так что смело назначайте событие: время обещает пройти устойчиво и без неприятных сюрпризов."}
+
+"""
+
+# Markdown code fence around a JSON answer; providers that ignore response_format may still add it
+_FENCE_RE = re.compile(r'\A\s*```(?:json)?\s*(.*?)\s*```\s*\Z', re.DOTALL)
+
+# Russian month (genitive) and weekday names for the prompt, independent of process locale
+_RU_MONTHS = (
+    "января", "февраля", "марта", "апреля", "мая", "июня",
+    "июля", "августа", "сентября", "октября", "ноября", "декабря",
+)
+_RU_WEEKDAYS = (
+    "понедельник", "вторник", "среда", "четверг", "пятница", "суббота", "воскресенье",
+)
+
+# Per-event part of the prompt, sent as the user message
+_USER_PROMPT_TMPL = """ИНФОРМАЦИЯ О СОБЫТИИ:
+Название: {event_name}
+Дата: {date_str} ({weekday_str})
+Время: {time_str}
+Описание: {event_description}
+
+АСТРОЛОГИЧЕСКИЙ КОНТЕКСТ:
+{astro_context}
+"""
+
+# Provider-side prompt cache bucket for SYSTEM_PROMPT
+PROMPT_CACHE_KEY = "astro_v2"
+
+# Structured output schema: the model is constrained to return exactly this JSON object
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "astro",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "result": {"type": "string", "enum": ["OK", "BAD"]},
+                "message": {"type": "string"}
+            },
+            "required": ["result", "message"],
+            "additionalProperties": False
+        }
+    }
+}
+
+# Result-only schema for --accuracy-only runs: metrics never use the message text
+ACCURACY_ONLY_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "astro_result",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "result": {"type": "string", "enum": ["OK", "BAD"]}
+            },
+            "required": ["result"],
+            "additionalProperties": False
+        }
+    }
+}
+
 
 class AstroAgentBenchmark:
     """
@@ -31,15 +153,140 @@ class AstroAgentBenchmark:
     3. Measuring classification performance against ground truth labels
     """
     
-    def __init__(self, api_key: str, dataset: List[dict] = None):
-        self.client = OpenAI(
+    def __init__(
+        self,
+        api_key: str,
+        dataset: List[dict] = None,
+        max_concurrency: int = 10,
+        cache_path: str = None,
+        semantic_threshold: Optional[float] = None,
+        accuracy_only: bool = False,
+        batch_api_key: Optional[str] = None
+    ):
+        # Pooled HTTP/2 client: many concurrent requests share a few warm TLS connections
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64),
+            timeout=httpx.Timeout(60, connect=10)
+        )
+        self.client = AsyncOpenAI(
             api_key=api_key,
-            base_url="https://openrouter.ai/api/v1"
+            base_url="https://openrouter.ai/api/v1",
+            http_client=http_client
         )
+        # Batch API is not available through OpenRouter, so --batch talks to OpenAI directly
+        self.batch_client = AsyncOpenAI(api_key=batch_api_key) if batch_api_key else None
+        self.batch_poll_interval = 30
+        self.model = "openai/gpt-4o-mini"
+        self.temperature = 0.3  # Low temperature for consistent predictions
+        # The answer is a short JSON object, so generation is capped well below the old 10000 tokens
+        if accuracy_only:
+            self.response_format = ACCURACY_ONLY_RESPONSE_FORMAT
+            self.max_tokens = 16
+        else:
+            self.response_format = RESPONSE_FORMAT
+            self.max_tokens = 256
+        self.max_concurrency = max_concurrency
         self.results = []
-        # Store dataset to simulate RAG knowledge base
-        self.knowledge_base = dataset if dataset else []
+        # Exact-match cache of raw LLM responses (disabled when cache_path is None)
+        self.cache = None
+        if cache_path:
+            self.cache = sqlite3.connect(cache_path)
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS resp (key TEXT PRIMARY KEY, content TEXT)"
+            )
+        # Semantic cache: reuse a response when a near-duplicate event was already evaluated
+        self.embedding_model = "qwen/qwen3-embedding-8b"
+        self.semantic_threshold = semantic_threshold
+        self._semantic_vectors: List[np.ndarray] = []
+        self._semantic_contents: List[str] = []
+        if self.semantic_threshold is not None and self.cache is not None:
+            # Rows are scoped like exact-match keys, so a changed model, prompt or schema never reuses old answers
+            self.cache.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_resp (scope TEXT, vec BLOB, content TEXT)"
+            )
+            rows = self.cache.execute(
+                "SELECT vec, content FROM semantic_resp WHERE scope = ?", (self._semantic_scope(),)
+            )
+            for vec, content in rows:
+                self._semantic_vectors.append(np.frombuffer(vec, dtype=np.float32))
+                self._semantic_contents.append(content)
+        # Store dataset to simulate RAG knowledge base, indexed by event id
+        self._kb_by_id = {entry['id']: entry for entry in (dataset or [])}
         
+    def _cache_key(self, prompt: str) -> str:
+        """Builds the response cache key from model, temperature and prompt."""
+        return hashlib.blake2b(
+            (
+                self.model
+                + str(self.temperature)
+                + self.response_format['json_schema']['name']
+                + SYSTEM_PROMPT
+                + prompt
+            ).encode('utf-8')
+        ).hexdigest()
+
+    def _semantic_scope(self) -> str:
+        """Identifies the generation settings and embedded text (the user prompt) of a semantic cache entry."""
+        return self._cache_key(self.embedding_model + ":prompt")
+
+    def _cache_get(self, prompt: str) -> str:
+        """Returns a cached raw response for the prompt, if any."""
+        if self.cache is None:
+            return None
+        row = self.cache.execute(
+            "SELECT content FROM resp WHERE key = ?", (self._cache_key(prompt),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _cache_put(self, prompt: str, content: str) -> None:
+        """Stores a raw response; committed once at the end of the run."""
+        if self.cache is None:
+            return
+        self.cache.execute(
+            "INSERT OR REPLACE INTO resp (key, content) VALUES (?, ?)",
+            (self._cache_key(prompt), content)
+        )
+
+    async def _embed(self, text: str) -> np.ndarray:
+        """Embeds text and L2-normalizes it so that dot product equals cosine similarity."""
+        response = await self.client.embeddings.create(
+            model=self.embedding_model,
+            input=[text],
+            encoding_format="float"
+        )
+        vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _semantic_get(self, vector: np.ndarray) -> Optional[str]:
+        """Returns the cached response of the most similar event above the threshold."""
+        if not self._semantic_vectors:
+            return None
+        similarities = np.vstack(self._semantic_vectors) @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.semantic_threshold:
+            return self._semantic_contents[best]
+        return None
+
+    def _semantic_put(self, vector: np.ndarray, content: str) -> None:
+        """Stores a response in the semantic cache (persisted with the exact-match cache)."""
+        self._semantic_vectors.append(vector)
+        self._semantic_contents.append(content)
+        if self.cache is not None:
+            self.cache.execute(
+                "INSERT INTO semantic_resp (scope, vec, content) VALUES (?, ?, ?)",
+                (self._semantic_scope(), vector.tobytes(), content)
+            )
+
+    def _report_cached_tokens(self, sample: dict, response) -> None:
+        """Prints how many prompt tokens were served from the provider prompt cache."""
+        usage = getattr(response, 'usage', None)
+        details = getattr(usage, 'prompt_tokens_details', None)
+        cached_tokens = getattr(details, 'cached_tokens', None)
+        if cached_tokens:
+            logger.info(f"  ⚡ #{sample['id']}: {cached_tokens}/{usage.prompt_tokens} токенов промпта из кэша провайдера")
+
     def _simulate_rag_search(self, event_data: dict) -> str:
         """
         Simulates RAG (Retrieval-Augmented Generation) search for astrological context.
@@ -59,182 +306,293 @@ class AstroAgentBenchmark:
             Astrological context string for the event
         """
         # Simulate similarity search by finding matching event in knowledge base
-        for entry in self.knowledge_base:
-            if entry['id'] == event_data.get('id'):
-                # Format as retrieved document chunks (similar to production)
-                context = f"[Retrieved Context - Source 1]:\n{entry['astro_context']}"
-                return context
+        entry = self._kb_by_id.get(event_data.get('id'))
+        if entry is not None:
+            # Format as retrieved document chunks (similar to production)
+            return f"[Retrieved Context - Source 1]:\n{entry['astro_context']}"
         
         # Fallback if not found
         return "[Retrieved Context - Source 1]:\nНет доступной астрологической информации для этой даты."
     
-    def _clean_json_response(self, content: str) -> str:
-        """
-        Cleans LLM response from markdown formatting.
-        
-        Args:
-            content: Raw LLM response string
-            
-        Returns:
-            Cleaned JSON string
-        """
-        content = content.strip()
-        
-        if content.startswith("```json"):
-            content = content[7:]
-        elif content.startswith("```"):
-            content = content[3:]
-        
-        if content.endswith("```"):
-            content = content[:-3]
-        
-        return content.strip()
-    
     def _create_astro_analysis_prompt(self, event_data: dict, astro_context: str) -> str:
-        """Создание промпта для астрологического анализа события (из ai_service.py)"""
+        """Создание пользовательской части промпта для астрологического анализа (из ai_service.py)"""
         
         event_datetime = datetime.fromisoformat(event_data['event_datetime'])
         event_name = event_data['event_name']
         event_description = event_data.get('description', '')
         
-        # Форматируем дату и время
-        date_str = event_datetime.strftime('%d %B %Y')
-        time_str = event_datetime.strftime('%H:%M')
-        weekday_str = event_datetime.strftime('%A')
+        # Форматируем дату и время по-русски, не завися от локали процесса
+        date_str = f"{event_datetime.day:02d} {_RU_MONTHS[event_datetime.month - 1]} {event_datetime.year}"
+        time_str = f"{event_datetime.hour:02d}:{event_datetime.minute:02d}"
+        weekday_str = _RU_WEEKDAYS[event_datetime.weekday()]
         
-        prompt = f"""Ты — профессиональный астролог. На основе предоставленного астрологического контекста дай краткий совет о планируемом событии.
-
-ИНФОРМАЦИЯ О СОБЫТИИ:
-Название: {event_name}
-Дата: {date_str} ({weekday_str})
-Время: {time_str}
-Описание: {event_description if event_description else 'Не указано'}
-
-АСТРОЛОГИЧЕСКИЙ КОНТЕКСТ:
-{astro_context}
-
-ЗАДАЧА:
-Проанализируй благоприятность этого времени для запланированного события на основе астрологического контекста.
-
-Твой ответ должен быть:
-1. Кратким (2-4 предложения)
-2. Конкретным (относиться именно к этому событию и времени)
-3. Практичным (давать конкретные рекомендации)
-4. Основанным на предоставленном астрологическом контексте
-5. Дружелюбным и понятным (избегай сложных астрологических терминов, пиши простым языком)
-6. Позитивным и поддерживающим (даже если время не идеально)
-7. Если время не подходит, то обязательно предложи другое время или дату
-
-Не повторяй информацию о событии, сразу переходи к астрологическому анализу.
-
-Всегда стремись найти позитивные аспекты и считать время скорее подходящим, если контекст не указывает на явные риски. 
-
-
-Верни ответ в формате JSON со следующей структурой:
-{{
-    "result": "OK/BAD",
-    "message": "Астрологические рекомендации"
-}}
-result может быть только OK или BAD, если время подходит, то OK, если нет, то BAD
-message может быть пустым
-
-Примеры:
-- {{"result": "OK", "message": "Астрологический совет: это хорошее время для этого события"}}
-- {{"result": "BAD", "message": "Согласно гороскопу, неделя с 3 по 9 ноября 2025 года для знака Водолей не описана,
-    но для знака Скорпион эта неделя — время мудрости и заботы о себе, рекомендуется слушать своё сердце и не усложнять задачи.
-    Это может говорить о том, что сейчас не самое благоприятное время для важных встреч, требующих концентрации и принятия решений.
-    Напутствие: попробуйте перенести встречу на более благоприятное время, например, на следующую неделю."}}
-- {{"result": "OK", "message": "Астрологический совет: Завтрашние транзиты выглядят спокойными — даже если день в целом кажется энергически неровным, в вашей личной конфигурации нет напряжённых аспектов, которые могли бы помешать встрече. Влияние планет скорее нейтральное, так что смело назначайте событие: время обещает пройти устойчиво и без неприятных сюрпризов."}}
-
-"""
-        
-        return prompt
+        return _USER_PROMPT_TMPL.format_map({
+            'event_name': event_name,
+            'date_str': date_str,
+            'weekday_str': weekday_str,
+            'time_str': time_str,
+            'event_description': event_description or 'Не указано',
+            'astro_context': astro_context,
+        })
     
-    def evaluate_sample(self, sample: dict) -> dict:
+    @retry(
+        retry=retry_if_exception_type(RETRYABLE_ERRORS),
+        wait=wait_random_exponential(multiplier=1, max=30),
+        stop=stop_after_attempt(6),
+        reraise=True
+    )
+    async def _call_llm(self, prompt: str):
         """
-        Evaluates a single sample from the dataset.
+        Sends the prompt to the model.
+        
+        Rate limits, connection problems and 5xx responses are retried with
+        jittered exponential backoff; any other error is raised immediately.
+        """
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            response_format=self.response_format,
+            extra_body={"prompt_cache_key": PROMPT_CACHE_KEY}
+        )
+
+    def _prebuild_prompts(self, dataset: List[dict]) -> List[Tuple[dict, str]]:
+        """
+        Builds prompts for the whole dataset in a single pass.
         
-        Simulates the production pipeline:
+        Simulates the local part of the production pipeline:
         1. RAG retrieval of astrological context
         2. Prompt construction with retrieved context
-        3. LLM inference
-        4. Response parsing and validation
+        
+        Args:
+            dataset: List of test samples
+            
+        Returns:
+            List of (sample, prompt) tuples in dataset order
+        """
+        return [
+            (sample, self._create_astro_analysis_prompt(sample, self._simulate_rag_search(sample)))
+            for sample in dataset
+        ]
+
+    async def evaluate_sample(self, sample: dict, prompt: str) -> dict:
+        """
+        Evaluates a single sample from the dataset.
+        
+        Runs the network part of the production pipeline:
+        1. LLM inference on the prebuilt prompt
+        2. Response parsing and validation
         
         Args:
             sample: Test sample containing event data and ground truth label
+            prompt: Prompt prebuilt by _prebuild_prompts
             
         Returns:
             Evaluation result dictionary with predictions and metadata
         """
-        print(f"🔮 Evaluating event #{sample['id']}: {sample['event_name']}...")
+        logger.info(f"🔮 Evaluating event #{sample['id']}: {sample['event_name']}...")
         
         try:
-            # Step 1: Simulate RAG retrieval (as in production ai_service.py)
-            astro_context = self._simulate_rag_search(sample)
-            
-            # Step 2: Construct prompt with retrieved context
-            prompt = self._create_astro_analysis_prompt(sample, astro_context)
-            
-            # Step 3: LLM inference with production model and parameters
-            response = self.client.chat.completions.create(
-                model="openai/gpt-4o-mini",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.3,  # Low temperature for consistent predictions
-                max_tokens=10000
-            )
-            
-            content = response.choices[0].message.content
-            
-            # Step 4: Parse and validate response
-            cleaned_content = self._clean_json_response(content)
-            prediction = json.loads(cleaned_content)
-            
-            predicted_result = prediction.get('result', 'UNKNOWN')
-            expected_result = sample['expected_result']
-            
-            # Проверяем корректность
-            is_correct = predicted_result == expected_result
+            # Step 1: LLM inference with production model and parameters
+            content = self._cache_get(prompt)
+            semantic_vector = None
+            if content is None and self.semantic_threshold is not None:
+                # The prebuilt prompt already holds the event and its retrieved context;
+                # the context decides the label, so events on days with different
+                # forecasts must not share an answer
+                semantic_vector = await self._embed(prompt)
+                content = self._semantic_get(semantic_vector)
+                if content is not None:
+                    # Borrowed answers stay out of the exact-match cache
+                    logger.info(f"  🧲 Ответ для #{sample['id']} взят из семантического кэша")
+            if content is None:
+                response = await self._call_llm(prompt)
+                self._report_cached_tokens(sample, response)
+                
+                content = response.choices[0].message.content
+                self._cache_put(prompt, content)
+                if semantic_vector is not None:
+                    self._semantic_put(semantic_vector, content)
+            elif semantic_vector is None:
+                logger.info(f"  💾 Ответ для #{sample['id']} взят из кэша")
             
-            result = {
-                'id': sample['id'],
-                'event_name': sample['event_name'],
-                'expected': expected_result,
-                'predicted': predicted_result,
-                'correct': is_correct,
-                'message': prediction.get('message', ''),
-                'raw_response': content[:200]  # Сохраняем первые 200 символов для отладки
-            }
+            return self._build_result(sample, content)
             
-            status = "✅" if is_correct else "❌"
-            print(f"  {status} Ожидали: {expected_result}, Получили: {predicted_result}")
+        except Exception as e:
+            return self._error_result(sample, e)
+    
+    def _build_result(self, sample: dict, content: str) -> dict:
+        """
+        Parses a raw model response and compares it with the ground truth label.
+        
+        Args:
+            sample: Test sample containing event data and ground truth label
+            content: Raw model response
             
-            return result
+        Returns:
+            Evaluation result dictionary with predictions and metadata
+        """
+        # Structured output guarantees valid JSON,
+        # the fence check only covers providers that ignore response_format
+        fence = _FENCE_RE.match(content)
+        prediction = json_loads(fence.group(1) if fence else content)
+        
+        predicted_result = prediction.get('result', 'UNKNOWN')
+        expected_result = sample['expected_result']
+        
+        # Проверяем корректность
+        is_correct = predicted_result == expected_result
+        
+        result = {
+            'id': sample['id'],
+            'event_name': sample['event_name'],
+            'expected': expected_result,
+            'predicted': predicted_result,
+            'correct': is_correct,
+            'message': prediction.get('message', ''),
+            'raw_response': content[:200]  # Сохраняем первые 200 символов для отладки
+        }
+        
+        status = "✅" if is_correct else "❌"
+        logger.info(f"  {status} #{sample['id']} Ожидали: {expected_result}, Получили: {predicted_result}")
+        
+        return result
+    
+    def _error_result(self, sample: dict, error: Exception) -> dict:
+        """Builds the ERROR result for a sample that could not be evaluated."""
+        logger.warning(f"  ⚠️ #{sample['id']} Ошибка при обработке: {error}")
+        return {
+            'id': sample['id'],
+            'event_name': sample['event_name'],
+            'expected': sample['expected_result'],
+            'predicted': 'ERROR',
+            'correct': False,
+            'message': str(error),
+            'raw_response': ''
+        }
+    
+    async def evaluate_batch(self, prompts: List[Tuple[dict, str]]) -> List[dict]:
+        """
+        Evaluates samples through the OpenAI Batch API.
+        
+        All uncached prompts are uploaded as one JSONL file, the batch is polled
+        until it finishes, and the output file is matched back by custom_id.
+        Batches are billed at half price but may take up to 24 hours.
+        
+        Args:
+            prompts: List of (sample, prompt) tuples from _prebuild_prompts
             
-        except Exception as e:
-            print(f"  ⚠️ Ошибка при обработке: {e}")
-            return {
-                'id': sample['id'],
-                'event_name': sample['event_name'],
-                'expected': sample['expected_result'],
-                'predicted': 'ERROR',
-                'correct': False,
-                'message': str(e),
-                'raw_response': ''
-            }
+        Returns:
+            Evaluation results in the same order as prompts
+        """
+        contents: Dict[str, str] = {}
+        pending = []
+        for sample, prompt in prompts:
+            content = self._cache_get(prompt)
+            if content is None:
+                pending.append((sample, prompt))
+            else:
+                contents[str(sample['id'])] = content
+        
+        errors: Dict[str, str] = {}
+        if pending:
+            errors = await self._run_batch_job(pending, contents)
+        
+        results = []
+        for sample, prompt in prompts:
+            custom_id = str(sample['id'])
+            if custom_id not in contents:
+                results.append(self._error_result(
+                    sample, RuntimeError(errors.get(custom_id, "Нет ответа в результатах батча"))
+                ))
+                continue
+            try:
+                results.append(self._build_result(sample, contents[custom_id]))
+            except Exception as e:
+                results.append(self._error_result(sample, e))
+        
+        return results
+    
+    async def _run_batch_job(self, pending: List[Tuple[dict, str]], contents: Dict[str, str]) -> Dict[str, str]:
+        """Submits pending prompts as one batch, fills contents by custom_id and returns per-id errors."""
+        batch_model = self.model.split('/', 1)[-1]  # OpenRouter "openai/gpt-4o-mini" -> "gpt-4o-mini"
+        batch_input_path = Path(__file__).parent / 'batch_input.jsonl'
+        with open(batch_input_path, 'w', encoding='utf-8') as f:
+            for sample, prompt in pending:
+                f.write(json.dumps({
+                    "custom_id": str(sample['id']),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": batch_model,
+                        "messages": [
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": self.temperature,
+                        "max_tokens": self.max_tokens,
+                        "response_format": self.response_format
+                    }
+                }, ensure_ascii=False) + "\n")
+        
+        with open(batch_input_path, 'rb') as f:
+            input_file = await self.batch_client.files.create(file=f, purpose='batch')
+        batch = await self.batch_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        print(f"📦 Батч {batch.id} отправлен ({len(pending)} запросов), ждем завершения...")
+        
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.batch_client.batches.retrieve(batch.id)
+            logger.info(f"  📦 Статус батча: {batch.status}")
+        
+        if not batch.output_file_id:
+            message = f"Батч {batch.id} завершился со статусом {batch.status}"
+            return {str(sample['id']): message for sample, _ in pending}
+        
+        prompts_by_id = {str(sample['id']): prompt for sample, prompt in pending}
+        errors: Dict[str, str] = {}
+        output = await self.batch_client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            item = json_loads(line)
+            custom_id = item['custom_id']
+            response = item.get('response') or {}
+            if item.get('error') or response.get('status_code') != 200:
+                errors[custom_id] = str(item.get('error') or response.get('body'))
+                continue
+            content = response['body']['choices'][0]['message']['content']
+            contents[custom_id] = content
+            self._cache_put(prompts_by_id[custom_id], content)
+        
+        return errors
     
     def calculate_metrics(self, results: List[dict]) -> Dict[str, float]:
         """Расчет метрик классификации"""
         
-        # Подсчет True Positive, True Negative, False Positive, False Negative
-        tp = sum(1 for r in results if r['expected'] == 'OK' and r['predicted'] == 'OK')
-        tn = sum(1 for r in results if r['expected'] == 'BAD' and r['predicted'] == 'BAD')
-        fp = sum(1 for r in results if r['expected'] == 'BAD' and r['predicted'] == 'OK')
-        fn = sum(1 for r in results if r['expected'] == 'OK' and r['predicted'] == 'BAD')
-        
         total = len(results)
-        errors = sum(1 for r in results if r['predicted'] == 'ERROR')
+        
+        # Булевы маски по всем результатам, дальше считаем одними векторными операциями
+        expected_ok = np.fromiter((r['expected'] == 'OK' for r in results), dtype=bool, count=total)
+        expected_bad = np.fromiter((r['expected'] == 'BAD' for r in results), dtype=bool, count=total)
+        predicted_ok = np.fromiter((r['predicted'] == 'OK' for r in results), dtype=bool, count=total)
+        predicted_bad = np.fromiter((r['predicted'] == 'BAD' for r in results), dtype=bool, count=total)
+        predicted_error = np.fromiter((r['predicted'] == 'ERROR' for r in results), dtype=bool, count=total)
+        
+        # Подсчет True Positive, True Negative, False Positive, False Negative
+        tp = int((expected_ok & predicted_ok).sum())
+        tn = int((expected_bad & predicted_bad).sum())
+        fp = int((expected_bad & predicted_ok).sum())
+        fn = int((expected_ok & predicted_bad).sum())
+        errors = int(predicted_error.sum())
         
         # Accuracy
         accuracy = (tp + tn) / total if total > 0 else 0
@@ -262,24 +620,33 @@ message может быть пустым
             'false_negative': fn
         }
     
-    def run_benchmark(self, dataset_path: str) -> Tuple[List[dict], Dict[str, float]]:
-        """Запуск бенчмарка на датасете"""
+    async def run_benchmark(
+        self,
+        dataset: Union[List[dict], str, Path],
+        batch: bool = False
+    ) -> Tuple[List[dict], Dict[str, float]]:
+        """Запуск бенчмарка на датасете (уже загруженном списке или пути к JSON файлу)"""
         print(f"📊 Начинаем бенчмарк астрологического агента")
-        print(f"📁 Загружаем датасет из: {dataset_path}\n")
         
-        # Загружаем датасет
-        with open(dataset_path, 'r', encoding='utf-8') as f:
-            dataset = json.load(f)
+        # Загружаем датасет, только если передан путь
+        if isinstance(dataset, (str, Path)):
+            print(f"📁 Загружаем датасет из: {dataset}\n")
+            with open(dataset, 'rb') as f:
+                dataset = json_loads(f.read())
         
         print(f"✨ Загружено {len(dataset)} примеров\n")
         
-        # Обрабатываем каждый пример
-        results = []
-        for i, sample in enumerate(dataset, 1):
-            print(f"[{i}/{len(dataset)}]", end=" ")
-            result = self.evaluate_sample(sample)
-            results.append(result)
-            print()
+        # Все промпты строим заранее, дальше остаются только запросы к LLM
+        prompts = self._prebuild_prompts(dataset)
+        
+        if batch:
+            results = await self.evaluate_batch(prompts)
+        else:
+            results = await self._evaluate_concurrently(prompts)
+
+        # Все записи в кэш фиксируем одной транзакцией
+        if self.cache is not None:
+            self.cache.commit()
         
         # Считаем метрики
         print("\n" + "="*80)
@@ -288,99 +655,175 @@ message может быть пустым
         
         return results, metrics
     
-    def save_metrics_report(self, metrics: Dict[str, float], results: List[dict], output_path: str):
+    async def _evaluate_concurrently(self, prompts: List[Tuple[dict, str]]) -> List[dict]:
+        """Evaluates samples with live requests, at most max_concurrency in flight."""
+        print(f"⚡ Параллельных запросов: {self.max_concurrency}\n")
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def _bounded(sample: dict, prompt: str) -> dict:
+            async with semaphore:
+                return await self.evaluate_sample(sample, prompt)
+
+        with logging_redirect_tqdm():
+            results = await tqdm_asyncio.gather(
+                *(_bounded(sample, prompt) for sample, prompt in prompts),
+                desc="Evaluating",
+                unit="sample"
+            )
+        
+        return results
+    
+    def save_metrics_report(self, metrics: Dict[str, float], results: List[dict], output_path: Path):
         """Сохранение отчета с метриками в Markdown"""
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("# 🔮 Отчет по бенчмарку астрологического агента\n\n")
-            
-            # Общая информация
-            f.write(f"**Дата запуска:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"**Модель:** OpenAI GPT-4o-mini (через OpenRouter)\n")
-            f.write(f"**Всего примеров:** {metrics['total_samples']}\n\n")
-            
-            # Основные метрики
-            f.write("## 📊 Основные метрики\n\n")
-            f.write("| Метрика | Значение | Описание |\n")
-            f.write("|---------|----------|----------|\n")
-            f.write(f"| **Accuracy** | {metrics['accuracy']:.2%} | Доля правильных предсказаний |\n")
-            f.write(f"| **Precision** | {metrics['precision']:.2%} | Точность положительных предсказаний (OK) |\n")
-            f.write(f"| **Recall** | {metrics['recall']:.2%} | Полнота (какую долю OK событий нашли) |\n")
-            f.write(f"| **F1-Score** | {metrics['f1']:.2%} | Гармоническое среднее Precision и Recall |\n\n")
-            
-            # Детальная статистика
-            f.write("## 📈 Детальная статистика\n\n")
-            f.write("| Показатель | Количество |\n")
-            f.write("|------------|------------|\n")
-            f.write(f"| Всего примеров | {metrics['total_samples']} |\n")
-            f.write(f"| Правильных предсказаний | {metrics['correct_predictions']} |\n")
-            f.write(f"| Ошибочных предсказаний | {metrics['total_samples'] - metrics['correct_predictions'] - metrics['errors']} |\n")
-            f.write(f"| Ошибок при обработке | {metrics['errors']} |\n\n")
-            
-            # Confusion Matrix
-            f.write("## 🎯 Матрица ошибок (Confusion Matrix)\n\n")
-            f.write("|  | Predicted OK | Predicted BAD |\n")
-            f.write("|---|---|---|\n")
-            f.write(f"| **Actual OK** | {metrics['true_positive']} (TP) | {metrics['false_negative']} (FN) |\n")
-            f.write(f"| **Actual BAD** | {metrics['false_positive']} (FP) | {metrics['true_negative']} (TN) |\n\n")
-            
-            # Интерпретация метрик
-            f.write("## 💡 Интерпретация результатов\n\n")
-            
-            if metrics['accuracy'] >= 0.8:
-                f.write("✨ **Отличный результат!** Модель хорошо справляется с определением благоприятности времени.\n\n")
-            elif metrics['accuracy'] >= 0.6:
-                f.write("👍 **Хороший результат.** Модель показывает приемлемую точность, но есть куда расти.\n\n")
-            else:
-                f.write("⚠️ **Требуется улучшение.** Модель часто ошибается в оценке благоприятности.\n\n")
-            
-            # Анализ типов ошибок
-            if metrics['false_positive'] > metrics['false_negative']:
-                f.write("- **Склонность к оптимизму:** Модель чаще говорит OK, когда нужно сказать BAD (False Positives).\n")
-                f.write("- Это означает, что агент может одобрять неблагоприятное время.\n\n")
-            elif metrics['false_negative'] > metrics['false_positive']:
-                f.write("- **Склонность к пессимизму:** Модель чаще говорит BAD, когда время благоприятно (False Negatives).\n")
-                f.write("- Это означает, что агент может отговаривать от хороших моментов.\n\n")
-            else:
-                f.write("- **Сбалансированная модель:** Ошибки распределены равномерно.\n\n")
-            
-            # Примеры ошибок
-            f.write("## ❌ Примеры неправильных предсказаний\n\n")
-            
-            errors = [r for r in results if not r['correct'] and r['predicted'] != 'ERROR']
-            
-            if errors:
-                f.write("### False Positives (сказали OK, а надо было BAD)\n\n")
-                fp_errors = [e for e in errors if e['expected'] == 'BAD' and e['predicted'] == 'OK']
-                if fp_errors:
-                    for err in fp_errors[:5]:  # Показываем первые 5
-                        f.write(f"- **{err['event_name']}** (ID: {err['id']})\n")
-                        f.write(f"  - Ожидали: {err['expected']}, Получили: {err['predicted']}\n\n")
-                else:
-                    f.write("_Таких ошибок не обнаружено_\n\n")
-                
-                f.write("### False Negatives (сказали BAD, а надо было OK)\n\n")
-                fn_errors = [e for e in errors if e['expected'] == 'OK' and e['predicted'] == 'BAD']
-                if fn_errors:
-                    for err in fn_errors[:5]:  # Показываем первые 5
-                        f.write(f"- **{err['event_name']}** (ID: {err['id']})\n")
-                        f.write(f"  - Ожидали: {err['expected']}, Получили: {err['predicted']}\n\n")
+        parts = []
+        
+        parts.append("# 🔮 Отчет по бенчмарку астрологического агента\n\n")
+        
+        # Общая информация
+        parts.append(
+            f"**Дата запуска:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"**Модель:** OpenAI GPT-4o-mini (через OpenRouter)\n"
+            f"**Всего примеров:** {metrics['total_samples']}\n\n"
+        )
+        
+        # Основные метрики
+        parts.append(
+            "## 📊 Основные метрики\n\n"
+            "| Метрика | Значение | Описание |\n"
+            "|---------|----------|----------|\n"
+            f"| **Accuracy** | {metrics['accuracy']:.2%} | Доля правильных предсказаний |\n"
+            f"| **Precision** | {metrics['precision']:.2%} | Точность положительных предсказаний (OK) |\n"
+            f"| **Recall** | {metrics['recall']:.2%} | Полнота (какую долю OK событий нашли) |\n"
+            f"| **F1-Score** | {metrics['f1']:.2%} | Гармоническое среднее Precision и Recall |\n\n"
+        )
+        
+        # Детальная статистика
+        parts.append(
+            "## 📈 Детальная статистика\n\n"
+            "| Показатель | Количество |\n"
+            "|------------|------------|\n"
+            f"| Всего примеров | {metrics['total_samples']} |\n"
+            f"| Правильных предсказаний | {metrics['correct_predictions']} |\n"
+            f"| Ошибочных предсказаний | {metrics['total_samples'] - metrics['correct_predictions'] - metrics['errors']} |\n"
+            f"| Ошибок при обработке | {metrics['errors']} |\n\n"
+        )
+        
+        # Confusion Matrix
+        parts.append(
+            "## 🎯 Матрица ошибок (Confusion Matrix)\n\n"
+            "|  | Predicted OK | Predicted BAD |\n"
+            "|---|---|---|\n"
+            f"| **Actual OK** | {metrics['true_positive']} (TP) | {metrics['false_negative']} (FN) |\n"
+            f"| **Actual BAD** | {metrics['false_positive']} (FP) | {metrics['true_negative']} (TN) |\n\n"
+        )
+        
+        # Интерпретация метрик
+        parts.append("## 💡 Интерпретация результатов\n\n")
+        
+        if metrics['accuracy'] >= 0.8:
+            parts.append("✨ **Отличный результат!** Модель хорошо справляется с определением благоприятности времени.\n\n")
+        elif metrics['accuracy'] >= 0.6:
+            parts.append("👍 **Хороший результат.** Модель показывает приемлемую точность, но есть куда расти.\n\n")
+        else:
+            parts.append("⚠️ **Требуется улучшение.** Модель часто ошибается в оценке благоприятности.\n\n")
+        
+        # Анализ типов ошибок
+        if metrics['false_positive'] > metrics['false_negative']:
+            parts.append(
+                "- **Склонность к оптимизму:** Модель чаще говорит OK, когда нужно сказать BAD (False Positives).\n"
+                "- Это означает, что агент может одобрять неблагоприятное время.\n\n"
+            )
+        elif metrics['false_negative'] > metrics['false_positive']:
+            parts.append(
+                "- **Склонность к пессимизму:** Модель чаще говорит BAD, когда время благоприятно (False Negatives).\n"
+                "- Это означает, что агент может отговаривать от хороших моментов.\n\n"
+            )
+        else:
+            parts.append("- **Сбалансированная модель:** Ошибки распределены равномерно.\n\n")
+        
+        # Примеры ошибок
+        parts.append("## ❌ Примеры неправильных предсказаний\n\n")
+        
+        # Раскладываем ошибки по типам за один проход
+        has_errors = False
+        fp_errors, fn_errors = [], []
+        for r in results:
+            if r['correct'] or r['predicted'] == 'ERROR':
+                continue
+            has_errors = True
+            if r['expected'] == 'BAD' and r['predicted'] == 'OK':
+                fp_errors.append(r)
+            elif r['expected'] == 'OK' and r['predicted'] == 'BAD':
+                fn_errors.append(r)
+        
+        if has_errors:
+            for title, bucket in (
+                ("### False Positives (сказали OK, а надо было BAD)\n\n", fp_errors),
+                ("### False Negatives (сказали BAD, а надо было OK)\n\n", fn_errors),
+            ):
+                parts.append(title)
+                if bucket:
+                    for err in bucket[:5]:  # Показываем первые 5
+                        parts.append(
+                            f"- **{err['event_name']}** (ID: {err['id']})\n"
+                            f"  - Ожидали: {err['expected']}, Получили: {err['predicted']}\n\n"
+                        )
                 else:
-                    f.write("_Таких ошибок не обнаружено_\n\n")
-            else:
-                f.write("🎉 **Ошибок не найдено!** Модель правильно предсказала все примеры.\n\n")
-            
-            # Заключение
-            f.write("## 🎭 Заключение\n\n")
-            f.write("Этот бенчмарк - шуточный, но показывает реальную способность модели анализировать ")
-            f.write("астрологический контекст и давать рекомендации. В реальном применении результаты ")
-            f.write("могут отличаться в зависимости от качества и полноты астрологических данных.\n\n")
-            
-            f.write("_Созвано звездами, проверено кодом_ ✨🔮\n")
+                    parts.append("_Таких ошибок не обнаружено_\n\n")
+        else:
+            parts.append("🎉 **Ошибок не найдено!** Модель правильно предсказала все примеры.\n\n")
+        
+        # Заключение
+        parts.append(
+            "## 🎭 Заключение\n\n"
+            "Этот бенчмарк - шуточный, но показывает реальную способность модели анализировать "
+            "астрологический контекст и давать рекомендации. В реальном применении результаты "
+            "могут отличаться в зависимости от качества и полноты астрологических данных.\n\n"
+            "_Созвано звездами, проверено кодом_ ✨🔮\n"
+        )
+        
+        Path(output_path).write_text("".join(parts), encoding='utf-8')
         
         print(f"\n💾 Отчет сохранен в: {output_path}")
 
 
+def parse_args() -> argparse.Namespace:
+    """Parses command line arguments for the benchmark run."""
+    parser = argparse.ArgumentParser(description="Astrological agent benchmark")
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        default=10,
+        help="Maximum number of LLM requests in flight at the same time"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the on-disk response cache and query the model for every sample"
+    )
+    parser.add_argument(
+        "--semantic-threshold",
+        type=float,
+        default=None,
+        help="Enable the semantic cache: reuse a response when cosine similarity "
+             "to an already evaluated event is at least this value (e.g. 0.92)"
+    )
+    parser.add_argument(
+        "--accuracy-only",
+        action="store_true",
+        help="Ask the model only for the OK/BAD result, without the recommendation text"
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Submit all samples through the OpenAI Batch API (cheaper, up to 24h); "
+             "requires OPENAI_BATCH_API_KEY with a direct OpenAI key"
+    )
+    return parser.parse_args()
+
+
 def main():
     """
     Main entry point for the benchmark execution.
@@ -388,6 +831,9 @@ def main():
     Loads configuration, initializes the benchmark suite, runs evaluation,
     and generates a comprehensive metrics report.
     """
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Load API key from environment
     api_key = os.getenv('OPENAI_API_KEY')
     
@@ -396,10 +842,17 @@ def main():
         print("   Please create .env file in project root with OPENAI_API_KEY=your_key")
         return
     
+    batch_api_key = os.getenv('OPENAI_BATCH_API_KEY') if args.batch else None
+    if args.batch and not batch_api_key:
+        print("❌ Error: OPENAI_BATCH_API_KEY not found in .env file")
+        print("   Batch mode needs a direct OpenAI key, OpenRouter does not provide the Batch API")
+        return
+    
     # Define file paths
     script_dir = Path(__file__).parent
     dataset_path = script_dir / 'dataset.json'
     output_path = script_dir / 'metrics.md'
+    cache_path = None if args.no_cache else script_dir / 'benchmark_cache.sqlite'
     
     # Validate dataset exists
     if not dataset_path.exists():
@@ -408,15 +861,23 @@ def main():
     
     # Load dataset for RAG knowledge base simulation
     print(f"📁 Loading dataset from: {dataset_path}")
-    with open(dataset_path, 'r', encoding='utf-8') as f:
-        dataset = json.load(f)
+    with open(dataset_path, 'rb') as f:
+        dataset = json_loads(f.read())
     
     # Initialize benchmark with dataset (for RAG simulation)
-    benchmark = AstroAgentBenchmark(api_key, dataset=dataset)
-    results, metrics = benchmark.run_benchmark(str(dataset_path))
+    benchmark = AstroAgentBenchmark(
+        api_key,
+        dataset=dataset,
+        max_concurrency=args.max_concurrency,
+        cache_path=str(cache_path) if cache_path else None,
+        semantic_threshold=args.semantic_threshold,
+        accuracy_only=args.accuracy_only,
+        batch_api_key=batch_api_key
+    )
+    results, metrics = asyncio.run(benchmark.run_benchmark(dataset, batch=args.batch))
     
     # Сохраняем отчет
-    benchmark.save_metrics_report(metrics, results, str(output_path))
+    benchmark.save_metrics_report(metrics, results, output_path)
     
     # Выводим итоговые метрики в консоль
     print("\n" + "="*80)
@@ -1,14 +1,14 @@
 import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
-from pyrogram import Client
-
-# Load environment variables
-load_dotenv()
 
 def main():
     """Interactive Telegram authentication."""
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+
     print("🔐 Telegram Authentication")
     print("=" * 40)
 
@@ -25,6 +25,9 @@ def main():
         print("\nPlease check your .env file.")
         return 1
 
+    # Imported only after validation: pyrogram pulls in heavy dependencies
+    from pyrogram import Client
+
     # Create sessions directory with proper permissions
     sessions_dir = Path("sessions")
     sessions_dir.mkdir(exist_ok=True)
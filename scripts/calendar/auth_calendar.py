@@ -1,12 +1,6 @@
 import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.oauth2.credentials import Credentials
-
-# Load environment variables
-load_dotenv()
 
 # Google Calendar API scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar']
@@ -14,6 +8,11 @@ SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 def main():
     """Interactive Google Calendar authentication."""
+    from dotenv import load_dotenv
+
+    # Load environment variables
+    load_dotenv()
+
     print("📅 Google Calendar Authentication")
     print("=" * 40)
 
@@ -36,6 +35,9 @@ def main():
         print("\nOr set GOOGLE_CALENDAR_CREDENTIALS_PATH in your .env file")
         return 1
 
+    # Imported only after validation: the Google auth stack is slow to import
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
     # Create token directory if it doesn't exist
     token_file.parent.mkdir(parents=True, exist_ok=True)
 
@@ -1,18 +1,46 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple
+
 from aiogram.types import CallbackQuery, Message
 from ...utils.logger import setup_logger
 from ..keyboards import KeyboardBuilder
 
 logger = setup_logger(__name__)
 
+CallbackHandler = Callable[[CallbackQuery], Awaitable[None]]
+
 
 class CallbackHandlers:
     def __init__(self):
-        pass
+        self._routes: Dict[str, CallbackHandler] = {}
+        self._debounce: Dict[str, float] = {}
+        self._pending: Dict[Tuple[int, str], asyncio.Task] = {}
+
+    def register(self, prefix: str, handler: CallbackHandler, debounce: float = 0.0) -> None:
+        """Register handler for callback data `prefix` or `prefix:<payload>`.
+
+        With `debounce` set, rapid repeated callbacks of this prefix from the same
+        chat are coalesced and only the last one is handled.
+        """
+        self._routes[prefix] = handler
+        if debounce > 0:
+            self._debounce[prefix] = debounce
 
     async def handle_callback(self, callback: CallbackQuery) -> None:
         try:
             data = callback.data
             logger.info(f"Received callback: {data} from user {callback.from_user.id}")
+
+            prefix = (data or "").partition(":")[0]
+            handler = self._routes.get(prefix)
+            if handler is not None:
+                delay = self._debounce.get(prefix)
+                if delay:
+                    self._schedule_debounced(prefix, handler, callback, delay)
+                else:
+                    await handler(callback)
+                return
+
             await callback.answer()
             logger.warning(f"Unhandled callback data: {data}")
             await callback.message.answer("⚠️ Эта функция еще не реализована.")
@@ -20,3 +48,44 @@ class CallbackHandlers:
         except Exception as e:
             logger.error(f"Error handling callback: {e}")
             await callback.answer("❌ Произошла ошибка", show_alert=True)
+
+    def _schedule_debounced(
+        self,
+        prefix: str,
+        handler: CallbackHandler,
+        callback: CallbackQuery,
+        delay: float
+    ) -> None:
+        chat = getattr(callback.message, "chat", None)
+        key = (chat.id if chat else callback.from_user.id, prefix)
+
+        previous = self._pending.get(key)
+        if previous is not None:
+            previous.cancel()
+
+        self._pending[key] = asyncio.create_task(
+            self._run_debounced(key, handler, callback, delay)
+        )
+
+    async def _run_debounced(
+        self,
+        key: Tuple[int, str],
+        handler: CallbackHandler,
+        callback: CallbackQuery,
+        delay: float
+    ) -> None:
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Superseded by a newer click; still acknowledge this one
+            await callback.answer()
+            raise
+
+        if self._pending.get(key) is asyncio.current_task():
+            del self._pending[key]
+
+        try:
+            await handler(callback)
+        except Exception as e:
+            logger.error(f"Error handling callback: {e}")
+            await callback.answer("❌ Произошла ошибка", show_alert=True)
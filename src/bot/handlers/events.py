@@ -1,11 +1,14 @@
+import asyncio
+from aiogram.enums import ParseMode
 from aiogram.types import Message, CallbackQuery
 from aiogram.types.user import User
+from itertools import islice
 from typing import List, Optional
-import pytz
 
 from ...models import Event
 from ...utils.logger import setup_logger
 from ...utils.helpers import format_time_remaining
+from ...utils.timezones import UTC, tz
 from ...config.settings import settings
 from ..keyboards import KeyboardBuilder
 from ...services.user_settings_service import UserSettingsService
@@ -13,6 +16,18 @@ from ...services.event_service import EventService
 
 logger = setup_logger(__name__)
 
+# Only the nearest events are rendered; the rest are summarized by count
+EVENTS_LIST_LIMIT = 10
+EVENTS_PAGE_SIZE = 5
+
+
+def _fmt_md_hm(dt) -> str:
+    return f"{dt.month:02d}/{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+def _fmt_hm(dt) -> str:
+    return f"{dt.hour:02d}:{dt.minute:02d}"
+
 
 class EventHandlers:
     def __init__(self, user_settings_service: UserSettingsService, event_service: EventService):
@@ -23,15 +38,15 @@ class EventHandlers:
         try:
             user_name = user.first_name or "User"
 
-            markup, welcome_text = KeyboardBuilder.main_menu()
+            markup, welcome_prefix, welcome_suffix = KeyboardBuilder.main_menu()
             handle_method = message.answer if to_answer else message.edit_text
             await handle_method(
-                welcome_text.format(user_name=user_name),
+                f"{welcome_prefix}{user_name}{welcome_suffix}",
                 reply_markup=markup,
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
         except Exception as e:
-            logger.error(f"Error in start handler: {e}")
+            logger.error("Error in start handler: %s", e)
             await message.answer("❌ Произошла ошибка. Попробуйте ещё раз.")
 
     async def handle_help(self, message: Message, user: User, to_answer: bool = True) -> None:
@@ -41,19 +56,24 @@ class EventHandlers:
             await handle_method(
                 help_text,
                 reply_markup=markup,
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
         except Exception as e:
-            logger.error(f"Error in help handler: {e}")
+            logger.error("Error in help handler: %s", e)
             await message.answer("❌ Произошла ошибка. Попробуйте ещё раз.")
 
     async def handle_list_events(self, message: Message, user: User, to_answer: bool = True) -> None:
         try:
             handle_method = message.answer if to_answer else message.edit_text
 
-            events = await self.event_service.get_user_events(
-                user_id=user.id,
-                active_only=True
+            events, total, owner_settings = await asyncio.gather(
+                self.event_service.get_user_events(
+                    user_id=user.id,
+                    active_only=True,
+                    limit=EVENTS_LIST_LIMIT
+                ),
+                self.event_service.count_user_events(user_id=user.id, active_only=True),
+                self.user_settings_service.get_owner_settings(),
             )
             if not events:
                 await handle_method(
@@ -61,53 +81,76 @@ class EventHandlers:
                     "У вас нет активных событий. Создайте событие с помощью:\n"
                     "`++event завтра 15:00 Встреча` или через голосовые сообщения",
                     reply_markup=KeyboardBuilder.empty_list("main_menu"),
-                    parse_mode="Markdown"
+                    parse_mode=ParseMode.MARKDOWN
                 )
                 return
 
-            owner_settings = await self.user_settings_service.get_owner_settings()
-            events_text = self._format_events_list(owner_settings.timezone, events)
+            events_text = self._format_events_list(owner_settings.timezone, events, total)
             await handle_method(
                 events_text,
-                reply_markup=KeyboardBuilder.event_list(events),
-                parse_mode="Markdown"
+                reply_markup=KeyboardBuilder.event_list(
+                    events[:EVENTS_PAGE_SIZE],
+                    page=0,
+                    has_next=total > EVENTS_PAGE_SIZE
+                ),
+                parse_mode=ParseMode.MARKDOWN
             )
         except Exception as e:
-            logger.error(f"Error listing events: {e}")
+            logger.error("Error listing events: %s", e)
             await message.answer("❌ Не удалось загрузить события. Попробуйте ещё раз.")
 
-    def _format_events_list(self, timezone, events: List[Event]) -> str:
+    async def handle_events_page(self, callback: CallbackQuery) -> None:
+        try:
+            page = max(int(callback.data.partition(":")[2]), 0)
+        except ValueError:
+            await callback.answer("Неверные данные колбэка")
+            return
+
+        try:
+            # One extra row tells whether there is a next page without a COUNT query
+            page_events = await self.event_service.get_user_events(
+                user_id=callback.from_user.id,
+                active_only=True,
+                offset=page * EVENTS_PAGE_SIZE,
+                limit=EVENTS_PAGE_SIZE + 1
+            )
+            await callback.answer()
+            await callback.message.edit_reply_markup(
+                reply_markup=KeyboardBuilder.event_list(
+                    page_events[:EVENTS_PAGE_SIZE],
+                    page=page,
+                    has_next=len(page_events) > EVENTS_PAGE_SIZE
+                )
+            )
+        except Exception as e:
+            logger.error("Error paging events: %s", e)
+            await callback.answer("❌ Не удалось загрузить события", show_alert=True)
+
+    def _format_events_list(self, timezone, events: List[Event], total: Optional[int] = None) -> str:
         if not events:
             return "📅 **События не найдены**"
 
-        # Get local timezone
-        local_tz = pytz.timezone(timezone)
+        # Get local timezone; naive datetimes are stored in UTC
+        if timezone == "UTC":
+            def _to_local(dt):
+                return dt.astimezone(UTC) if dt.tzinfo else dt
+        else:
+            local_tz = tz(timezone)
 
-        lines = ["📅 **Ваши события**", ""]
-        for i, event in enumerate(events[:10], 1):
-            # Convert to local timezone
-            if event.event_datetime.tzinfo is None:
-                event_datetime = pytz.UTC.localize(event.event_datetime)
-            else:
-                event_datetime = event.event_datetime
-            local_event_datetime = event_datetime.astimezone(local_tz)
+            def _to_local(dt):
+                return (dt if dt.tzinfo else dt.replace(tzinfo=UTC)).astimezone(local_tz)
 
-            time_str = local_event_datetime.strftime("%m/%d %H:%M")
+        rows = []
+        for event in islice(events, EVENTS_LIST_LIMIT):
+            time_str = _fmt_md_hm(_to_local(event.event_datetime))
             if event.end_datetime:
-                if event.end_datetime.tzinfo is None:
-                    end_datetime = pytz.UTC.localize(event.end_datetime)
-                else:
-                    end_datetime = event.end_datetime
-                local_end_datetime = end_datetime.astimezone(local_tz)
-                end_str = local_end_datetime.strftime("%H:%M")
+                end_str = _fmt_hm(_to_local(event.end_datetime))
                 time_str += f"-{end_str}"
             time_remaining = format_time_remaining(event.event_datetime)
             status_icon = "🟢" if not event.is_overdue else "🔴"
-            event_line = f"{status_icon} **{event.event_name}**"
-            time_line = f"   📅 {time_str} • {time_remaining}"
-            lines.extend([event_line, time_line])
-            if i < len(events):
-                lines.append("")
-        if len(events) > 10:
-            lines.append(f"... и ещё {len(events) - 10} событий")
-        return "\n".join(lines)
+            rows.append(f"{status_icon} **{event.event_name}**\n   📅 {time_str} • {time_remaining}")
+        if total is None:
+            total = len(events)
+        if total > EVENTS_LIST_LIMIT:
+            rows.append(f"... и ещё {total - EVENTS_LIST_LIMIT} событий")
+        return "📅 **Ваши события**\n\n" + "\n\n".join(rows)
@@ -1,3 +1,4 @@
+from aiogram.enums import ParseMode
 from aiogram.types import Message, CallbackQuery
 from aiogram.types.user import User
 
@@ -7,6 +8,32 @@ from ..keyboards import KeyboardBuilder
 
 logger = setup_logger(__name__)
 
+_REMINDERS_HELP = (
+    "Введите команду `/set_reminders 15m,1h,1d` чтобы обновить напоминания.\n"
+    "Значения перечисляются через запятую.\n"
+    "Поддерживаемые единицы: `m`, `h`, `d`.\n"
+    "_Пример:_ `/set_reminders 10m,30m,2h`"
+)
+_DATE_HELP = (
+    "Введите команду `/set_date_format %d.%m.%Y %H:%M` чтобы обновить формат даты.\n"
+    "Используются стандартные плейсхолдеры Python `strftime`."
+)
+_BIRTHDAY_HELP = (
+    "Введите команду `/set_birthday YYYY-MM-DD` чтобы сохранить дату рождения.\n"
+    "Используйте `clear`, чтобы удалить значение.\n"
+    "_Пример:_ `/set_birthday 1990-05-17`"
+)
+_TZ_NOT_IMPL = "Изменение часового пояса пока не реализовано."
+
+# settings_<action> callback -> (response text, parse mode)
+_CALLBACK_RESPONSES = {
+    "reminders": (_REMINDERS_HELP, ParseMode.MARKDOWN),
+    "date_format": (_DATE_HELP, ParseMode.MARKDOWN),
+    "birthday": (_BIRTHDAY_HELP, ParseMode.MARKDOWN),
+    "timezone": (_TZ_NOT_IMPL, None),
+}
+
+
 class SettingsHandlers:
     """Handlers for settings-related commands."""
 
@@ -15,17 +42,17 @@ class SettingsHandlers:
 
     async def handle_settings(self, message: Message, user: User, to_answer: bool = True) -> None:
         try:
-            logger.info(f"Going to settings page: {user.id}")
+            logger.info("Going to settings page: %s", user.id)
             owner_settings = await self.user_settings_service.get_owner_settings()
             settings_text = self.user_settings_service.generate_user_settings_text(owner_settings)
             handle_method = message.answer if to_answer else message.edit_text
             await handle_method(
                 settings_text,
                 reply_markup=KeyboardBuilder.settings_menu(),
-                parse_mode="Markdown"
+                parse_mode=ParseMode.MARKDOWN
             )
         except Exception as e:
-            logger.error(f"Error in settings handler: {e}")
+            logger.error("Error in settings handler: %s", e)
             await message.answer("❌ Не удалось загрузить настройки. Попробуйте ещё раз.")
 
     async def handle_settings_menu(self, message: Message) -> None:
@@ -38,50 +65,24 @@ class SettingsHandlers:
                 await callback.answer("Неверные данные колбэка")
                 return
 
-            parts = data.split("_")
-            if len(parts) == 1:
+            _, sep, action = data.partition("_")
+            if not sep:
                 await callback.answer()
                 await self.handle_settings(callback.message, callback.from_user, to_answer=False)
                 return
 
-            action = parts[1]
             await callback.answer()
 
-            if action == "reminders":
-                await callback.message.answer(
-                    "Введите команду `/set_reminders 15m,1h,1d` чтобы обновить напоминания.\n"
-                    "Значения перечисляются через запятую.\n"
-                    "Поддерживаемые единицы: `m`, `h`, `d`.\n"
-                    "_Пример:_ `/set_reminders 10m,30m,2h`",
-                    parse_mode="Markdown"
-                )
-                return
-
-            if action == "date":
-                await callback.message.answer(
-                    "Введите команду `/set_date_format %d.%m.%Y %H:%M` чтобы обновить формат даты.\n"
-                    "Используются стандартные плейсхолдеры Python `strftime`.",
-                    parse_mode="Markdown"
-                )
-                return
-
-            if action == "birthday":
-                await callback.message.answer(
-                    "Введите команду `/set_birthday YYYY-MM-DD` чтобы сохранить дату рождения.\n"
-                    "Используйте `clear`, чтобы удалить значение.\n"
-                    "_Пример:_ `/set_birthday 1990-05-17`",
-                    parse_mode="Markdown"
-                )
-                return
-
-            if action == "timezone":
-                await callback.message.answer("Изменение часового пояса пока не реализовано.")
+            response = _CALLBACK_RESPONSES.get(action)
+            if response is not None:
+                text, parse_mode = response
+                await callback.message.answer(text, parse_mode=parse_mode)
                 return
 
             await callback.message.answer("⚠️ Эта настройка ещё не поддерживается.")
 
         except Exception as e:
-            logger.error(f"Error in settings callback: {e}")
+            logger.error("Error in settings callback: %s", e)
             await callback.answer("❌ Не удалось обработать запрос к настройкам", show_alert=True)
 
     async def handle_set_birthday_command(self, message: Message) -> None:
@@ -117,10 +118,8 @@ class SettingsHandlers:
             await message.answer(f"❌ {exc}")
             return
 
-        await message.answer(f"🗓 Формат даты обновлён: `{updated.date_format}`", parse_mode="Markdown")
+        await message.answer(f"🗓 Формат даты обновлён: `{updated.date_format}`", parse_mode=ParseMode.MARKDOWN)
 
     def _extract_argument(self, message: Message) -> str:
-        if not message.text:
-            return ""
-        parts = message.text.split(maxsplit=1)
-        return parts[1].strip() if len(parts) > 1 else ""
+        _, sep, rest = (message.text or "").partition(" ")
+        return rest.strip() if sep else ""
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import List
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
@@ -7,23 +8,36 @@ from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Short callback opcodes; Telegram limits callback_data to 64 bytes
+CB_EVENT = "e"
+CB_PAGE = "p"
 
-class KeyboardBuilder:
-    @classmethod
-    def main_menu(cls) -> tuple[InlineKeyboardMarkup, str]:
-        builder = InlineKeyboardBuilder()
 
-        builder.row(
-            InlineKeyboardButton(text="📅 Мои события", callback_data="list_events"),
-            #InlineKeyboardButton(text="🔄 Синхронизация календаря", callback_data="sync_calendar"),
-        )
-        builder.row(
-            InlineKeyboardButton(text="❓ Помощь", callback_data="help"),
-            InlineKeyboardButton(text="⚙️ Настройки", callback_data="settings"),
-        )
+def _callback_data(opcode: str, value) -> str:
+    data = f"{opcode}:{value}"
+    # Telegram rejects callback_data over 64 bytes; the check must survive python -O
+    if len(data.encode("utf-8")) > 64:
+        raise ValueError(f"callback_data too long: {data!r}")
+    return data
+
+
+# Buttons shared by every events page; aiogram buttons are immutable DTOs
+_BACK_TO_MENU_BTN = InlineKeyboardButton(text="🔙 Назад в меню", callback_data="main_menu")
+_PAGE_BTN_TEXT = {-1: "◀️ Назад", 1: "Далее ▶️"}
 
-        welcome_text = """
-🎯 Добро пожаловать в AstroBot, {user_name}!
+
+@lru_cache(maxsize=64)
+def _page_btn(direction: int, page: int) -> InlineKeyboardButton:
+    return InlineKeyboardButton(
+        text=_PAGE_BTN_TEXT[direction],
+        callback_data=_callback_data(CB_PAGE, page + direction)
+    )
+
+
+# Welcome text is split around the user name so it can be composed without str.format
+_WELCOME_PREFIX = """
+🎯 Добро пожаловать в AstroBot, """
+_WELCOME_SUFFIX = """!
 
 Я — ваш умный помощник для управления встречами и событиями прямо в Telegram.
 Создаю события по голосовым сообщениям, понимаю естественный язык, поддерживаю команду `++event`
@@ -47,17 +61,8 @@ class KeyboardBuilder:
 
 Готовы сделать своё расписание удачным по версии вселенной? 🗓️✨
 """
-        return builder.as_markup(), welcome_text
-
-    @classmethod
-    def help_menu(self) -> tuple[InlineKeyboardMarkup, str]:
-        builder = InlineKeyboardBuilder()
-
-        builder.row(
-            InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")
-        )
 
-        help_text = """
+_HELP_TEXT = """
 📚 **Справка — AstroBot**
 
 ### ✨ Создание событий
@@ -101,10 +106,40 @@ class KeyboardBuilder:
 
 Если хотите, я могу подробнее рассказать о любой функции — просто спросите!
 """
-        return builder.as_markup(), help_text
 
-    @classmethod
-    def settings_menu(cls) -> InlineKeyboardMarkup:
+
+class KeyboardBuilder:
+    # Static menus are built once and shared; callers must not mutate them.
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def main_menu() -> tuple[InlineKeyboardMarkup, str, str]:
+        builder = InlineKeyboardBuilder()
+
+        builder.row(
+            InlineKeyboardButton(text="📅 Мои события", callback_data="list_events"),
+            #InlineKeyboardButton(text="🔄 Синхронизация календаря", callback_data="sync_calendar"),
+        )
+        builder.row(
+            InlineKeyboardButton(text="❓ Помощь", callback_data="help"),
+            InlineKeyboardButton(text="⚙️ Настройки", callback_data="settings"),
+        )
+
+        return builder.as_markup(), _WELCOME_PREFIX, _WELCOME_SUFFIX
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def help_menu() -> tuple[InlineKeyboardMarkup, str]:
+        builder = InlineKeyboardBuilder()
+
+        builder.row(
+            InlineKeyboardButton(text="🔙 Назад", callback_data="main_menu")
+        )
+
+        return builder.as_markup(), _HELP_TEXT
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def settings_menu() -> InlineKeyboardMarkup:
         builder = InlineKeyboardBuilder()
 
         builder.row(
@@ -125,7 +160,9 @@ class KeyboardBuilder:
 
         return builder.as_markup()
 
-    def empty_list(self, back_callback: str = "main_menu") -> InlineKeyboardMarkup:
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def empty_list(back_callback: str = "main_menu") -> InlineKeyboardMarkup:
         """Build keyboard for empty lists."""
         builder = InlineKeyboardBuilder()
 
@@ -135,13 +172,11 @@ class KeyboardBuilder:
 
         return builder.as_markup()
 
-    def event_list(events: List[Event], page: int = 0, per_page: int = 5) -> InlineKeyboardMarkup:
+    @staticmethod
+    def event_list(page_events: List[Event], page: int = 0, has_next: bool = False) -> InlineKeyboardMarkup:
+        """Build keyboard for a single, already fetched page of events."""
         builder = InlineKeyboardBuilder()
 
-        start_idx = page * per_page
-        end_idx = min(start_idx + per_page, len(events))
-        page_events = events[start_idx:end_idx]
-
         for event in page_events:
             event_text = f"📅 {event.event_name}"
             if len(event_text) > 30:
@@ -150,27 +185,21 @@ class KeyboardBuilder:
             builder.row(
                 InlineKeyboardButton(
                     text=event_text,
-                    callback_data=f"event_details:{event.id}"
+                    callback_data=_callback_data(CB_EVENT, event.id)
                 )
             )
 
         pagination_buttons = []
 
         if page > 0:
-            pagination_buttons.append(
-                InlineKeyboardButton(text="◀️ Назад", callback_data=f"events_page:{page-1}")
-            )
+            pagination_buttons.append(_page_btn(-1, page))
 
-        if end_idx < len(events):
-            pagination_buttons.append(
-                InlineKeyboardButton(text="Далее ▶️", callback_data=f"events_page:{page+1}")
-            )
+        if has_next:
+            pagination_buttons.append(_page_btn(1, page))
 
         if pagination_buttons:
             builder.row(*pagination_buttons)
 
-        builder.row(
-            InlineKeyboardButton(text="🔙 Назад в меню", callback_data="main_menu")
-        )
+        builder.row(_BACK_TO_MENU_BTN)
 
         return builder.as_markup()
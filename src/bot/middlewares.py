@@ -0,0 +1,32 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, Message, TelegramObject
+
+from ..utils.helpers import is_owner
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class OwnerOnlyMiddleware(BaseMiddleware):
+    """Reject messages and callbacks from anyone but the owner before dispatch."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user = getattr(event, "from_user", None)
+        user_id = getattr(user, "id", None)
+        if user_id is not None and is_owner(user_id):
+            return await handler(event, data)
+
+        if isinstance(event, CallbackQuery):
+            logger.warning("Blocked callback from non-owner user %s", user_id)
+            await event.answer("🚫 У вас нет доступа к этому боту", show_alert=True)
+        elif isinstance(event, Message):
+            logger.warning("Blocked command from non-owner user %s", user_id)
+            await event.answer("🚫 Этот бот доступен только владельцу.")
+        return None
@@ -1,7 +1,9 @@
+from datetime import timedelta
 from typing import Optional
-from aiogram import Bot, Dispatcher, F
+from aiogram import Bot, Dispatcher
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 
 from ..services.service import Service
@@ -10,14 +12,21 @@ from ..services.event_service import EventService
 from ..config.settings import settings
 from ..utils.logger import setup_logger
 from ..utils.exceptions import TelegramError
-from ..utils.helpers import is_owner
 from .handlers.settings import SettingsHandlers
 from .handlers.events import EventHandlers
 from .handlers.callbacks import CallbackHandlers
+from .keyboards import CB_PAGE
+from .middlewares import OwnerOnlyMiddleware
 
 
 logger = setup_logger(__name__)
 
+# Matches the 48 hour event editing window
+FSM_TTL = timedelta(hours=48)
+
+# Rapid page flips are coalesced so only the last page is rendered
+PAGE_DEBOUNCE = 0.05
+
 
 class TelegramBot(Service):
     def __init__(self, user_settings_service: UserSettingsService, event_service: EventService):
@@ -38,7 +47,9 @@ class TelegramBot(Service):
 
         try:
             self.bot = Bot(token=settings.telegram_bot_token)
-            self.dp = Dispatcher(storage=MemoryStorage())
+            self.dp = Dispatcher(storage=self._create_storage())
+            self.dp.message.middleware(OwnerOnlyMiddleware())
+            self.dp.callback_query.middleware(OwnerOnlyMiddleware())
 
             self.event_handlers = EventHandlers(
                 user_settings_service=self.user_settings_service,
@@ -50,6 +61,7 @@ class TelegramBot(Service):
             )
 
             self.callback_handlers = CallbackHandlers()
+            self._register_callback_routes()
 
             self._setup_handlers()
 
@@ -59,6 +71,20 @@ class TelegramBot(Service):
             logger.error(f"Failed to initialize telegram bot: {e}")
             raise TelegramError(f"Failed to initialize telegram bot: {e}")
 
+    def _create_storage(self) -> BaseStorage:
+        if not settings.redis_url:
+            return MemoryStorage()
+
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        logger.info("Using Redis FSM storage")
+        return RedisStorage.from_url(
+            settings.redis_url,
+            connection_kwargs={"max_connections": 20},
+            state_ttl=FSM_TTL,
+            data_ttl=FSM_TTL,
+        )
+
     async def start(self):
         await super().start()
 
@@ -73,7 +99,8 @@ class TelegramBot(Service):
             self._running = True
             logger.info("Starting bot polling...")
 
-            await self.dp.start_polling(self.bot)
+            # Signals are handled by the application, which stops all services
+            await self.dp.start_polling(self.bot, handle_signals=False)
 
         except Exception as e:
             logger.error(f"Failed to start bot: {e}")
@@ -88,103 +115,68 @@ class TelegramBot(Service):
 
         try:
             await self.bot.session.close()
+            await self.dp.storage.close()
             self._running = False
             logger.info("Telegram bot stopped")
 
         except Exception as e:
             logger.error(f"Error stopping bot: {e}")
 
+    def _register_callback_routes(self):
+        async def main_menu_callback(callback: CallbackQuery):
+            await callback.answer()
+            await self.event_handlers.handle_start(callback.message, callback.from_user, to_answer=False)
+
+        async def help_callback(callback: CallbackQuery):
+            await callback.answer()
+            await self.event_handlers.handle_help(callback.message, callback.from_user, to_answer=False)
+
+        async def list_events_callback(callback: CallbackQuery):
+            await self.event_handlers.handle_list_events(callback.message, callback.from_user, to_answer=False)
+
+        routes = self.callback_handlers
+        routes.register("main_menu", main_menu_callback)
+        routes.register("help", help_callback)
+        routes.register("list_events", list_events_callback)
+        routes.register(CB_PAGE, self.event_handlers.handle_events_page, debounce=PAGE_DEBOUNCE)
+        for key in (
+            "settings",
+            "settings_reminders",
+            "settings_timezone",
+            "settings_date_format",
+            "settings_birthday",
+        ):
+            routes.register(key, self.settings_handlers.handle_settings_callback)
+
     def _setup_handlers(self):
         @self.dp.message(Command("start"))
         async def start_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.event_handlers.handle_start(message, message.from_user, to_answer=True)
 
-        @self.dp.callback_query(F.data.startswith("main_menu"))
-        async def main_menu_callback(callback: CallbackQuery):
-            if not await self._ensure_owner_callback(callback):
-                return
-            await callback.answer()
-            await self.event_handlers.handle_start(callback.message, callback.from_user, to_answer=False)
-
         @self.dp.message(Command("help"))
         async def help_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.event_handlers.handle_help(message, message.from_user, to_answer=True)
 
-        @self.dp.callback_query(F.data.startswith("help"))
-        async def help_callback(callback: CallbackQuery):
-            if not await self._ensure_owner_callback(callback):
-                return
-            await callback.answer()
-            await self.event_handlers.handle_help(callback.message, callback.from_user, to_answer=False)
-
         @self.dp.message(Command("settings"))
         async def settings_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.settings_handlers.handle_settings_menu(message)
 
-        @self.dp.callback_query(F.data.startswith("settings"))
-        async def settings_callback(callback: CallbackQuery):
-            if not await self._ensure_owner_callback(callback):
-                return
-            await self.settings_handlers.handle_settings_callback(callback)
-
         @self.dp.message(Command("events"))
         async def events_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.event_handlers.handle_list_events(message, message.from_user, to_answer=True)
 
-        @self.dp.callback_query(F.data.startswith("list_events"))
-        async def list_events_callback(callback: CallbackQuery):
-            if not await self._ensure_owner_callback(callback):
-                return
-            await self.event_handlers.handle_list_events(callback.message, callback.from_user, to_answer=False)
-
         @self.dp.message(Command("set_birthday"))
         async def set_birthday_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.settings_handlers.handle_set_birthday_command(message)
 
         @self.dp.message(Command("set_reminders"))
         async def set_reminders_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.settings_handlers.handle_set_reminders_command(message)
 
         @self.dp.message(Command("set_date_format"))
         async def set_date_format_command(message: Message):
-            if not await self._ensure_owner_message(message):
-                return
             await self.settings_handlers.handle_set_date_format_command(message)
 
         @self.dp.callback_query()
         async def handle_callbacks(callback: CallbackQuery):
-            if not await self._ensure_owner_callback(callback):
-                return
             await self.callback_handlers.handle_callback(callback)
-
-    async def _ensure_owner_message(self, message: Message) -> bool:
-        user = getattr(message, "from_user", None)
-        user_id = getattr(user, "id", None)
-        if user_id is not None and is_owner(user_id):
-            return True
-
-        logger.warning("Blocked command from non-owner user %s", user_id)
-        await message.answer("🚫 Этот бот доступен только владельцу.")
-        return False
-
-    async def _ensure_owner_callback(self, callback: CallbackQuery) -> bool:
-        user = getattr(callback, "from_user", None)
-        user_id = getattr(user, "id", None)
-        if user_id is not None and is_owner(user_id):
-            return True
-
-        logger.warning("Blocked callback from non-owner user %s", user_id)
-        await callback.answer("🚫 У вас нет доступа к этому боту", show_alert=True)
-        return False
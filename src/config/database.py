@@ -7,7 +7,24 @@ logger = setup_logger(__name__)
 
 
 TORTOISE_ORM = {
-    "connections": {"default": settings.database_url},
+    "connections": {
+        "default": {
+            "engine": "tortoise.backends.asyncpg",
+            "credentials": {
+                "host": settings.postgres_host,
+                "port": settings.postgres_port,
+                "user": settings.postgres_user,
+                "password": settings.postgres_password,
+                "database": settings.postgres_db,
+                # Passed through to asyncpg.create_pool
+                "minsize": 5,
+                "maxsize": 30,
+                "statement_cache_size": 1024,
+                # JIT only slows down the short OLTP queries the bot runs
+                "server_settings": {"jit": "off", "application_name": "astrobot"},
+            },
+        },
+    },
     "apps": {
         "models": {
             "models": ["src.models", "aerich.models"],
@@ -20,13 +37,19 @@ async def init_db():
     try:
         logger.info("Initializing database connection...")
 
-        await Tortoise.init(
-            db_url=settings.database_url,
-            modules={"models": ["src.models"]},
-        )
+        await Tortoise.init(config={
+            "connections": TORTOISE_ORM["connections"],
+            "apps": {
+                "models": {
+                    "models": ["src.models"],
+                    "default_connection": "default",
+                },
+            },
+        })
 
         logger.info("Database initialized successfully")
-        await Tortoise.generate_schemas()
+        if settings.auto_migrate:
+            await Tortoise.generate_schemas(safe=True)
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         raise
@@ -1,7 +1,7 @@
-from typing import List
+from typing import Annotated, List, Union
 
-from pydantic import validator
-from pydantic_settings import BaseSettings
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, NoDecode
 
 
 class Settings(BaseSettings):
@@ -18,10 +18,13 @@ class Settings(BaseSettings):
     postgres_port: int = 5432
 
     timezone: str = "UTC"
-    default_reminder_times: str = "15m,1h"
+    default_reminder_times: Annotated[List[str], NoDecode] = ["15m", "1h"]
 
     log_level: str = "INFO"
 
+    # Create missing tables on startup; disable once the schema is managed by aerich
+    auto_migrate: bool = True
+
     yandex_folder_id: str = ""
     yandex_api_key: str = ""
 
@@ -33,18 +36,16 @@ class Settings(BaseSettings):
 
     deepgram_api_key: str = ""
 
-    @validator("default_reminder_times")
-    def parse_reminder_times(cls, v: str) -> List[str]:
+    # Optional Redis for persistent bot FSM storage; in-memory when empty
+    redis_url: str = ""
+
+    @field_validator("default_reminder_times", mode="before")
+    @classmethod
+    def parse_reminder_times(cls, v: Union[str, List[str]]) -> List[str]:
         """Parse comma-separated reminder times."""
-        return [time.strip() for time in v.split(",") if time.strip()]
-
-    @property
-    def database_url(self) -> str:
-        """Generate database URL for TortoiseORM."""
-        return (
-            f"asyncpg://{self.postgres_user}:{self.postgres_password}"
-            f"@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
-        )
+        if isinstance(v, str):
+            v = v.split(",")
+        return [time.strip() for time in v if time.strip()]
 
     class Config:
         env_file = ".env"
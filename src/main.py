@@ -2,35 +2,35 @@ import asyncio
 import sys
 import signal
 from functools import partial
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
 from .utils.logger import setup_logger
-from .bot.service import TelegramBot
-from .userbot.service import UserBot
 from .config.settings import settings
 from .config.database import init_db, close_db
 from .services.service import Service
-from .services.ai_service import AiService
-from .services.search_service import SearchService
-from .services.event_service import EventService
-from .services.asr_service import AsrService
-from .services.scheduler_service import SchedulerService
-from .services.user_settings_service import UserSettingsService
-from .services.calendar_service import CalendarService
 from .utils.exceptions import BaseError
 
+if TYPE_CHECKING:
+    from .bot.service import TelegramBot
+    from .userbot.service import UserBot
+    from .services.ai_service import AiService
+    from .services.asr_service import AsrService
+    from .services.scheduler_service import SchedulerService
+    from .services.calendar_service import CalendarService
+
 logger = setup_logger(__name__)
 
 
 class Application:
     def __init__(self):
-        self.scheduler_service: Optional[SchedulerService] = None
-        self.calendar_service: Optional[CalendarService] = None
-        self.ai_service: Optional[AiService] = None
-        self.bot: Optional[TelegramBot] = None
-        self.user_bot: Optional[UserBot] = None
+        self.scheduler_service: Optional["SchedulerService"] = None
+        self.calendar_service: Optional["CalendarService"] = None
+        self.ai_service: Optional["AiService"] = None
+        self.bot: Optional["TelegramBot"] = None
+        self.user_bot: Optional["UserBot"] = None
         self.services: List[Service] = []
-        self.asr_service: Optional[AsrService] = None
+        self.service_tiers: List[List[Service]] = []
+        self.asr_service: Optional["AsrService"] = None
 
     async def initialize_services(self):
         try:
@@ -39,32 +39,32 @@ class Application:
             logger.info("Initializing database...")
             await init_db()
 
-            self.scheduler_service = SchedulerService()
-            self.services.append(self.scheduler_service)
+            # Heavy service modules (LLM, Google API, Telegram clients) are
+            # imported only when the application actually starts
+            from .bot.service import TelegramBot
+            from .userbot.service import UserBot
+            from .services.ai_service import AiService
+            from .services.search_service import SearchService
+            from .services.event_service import EventService
+            from .services.asr_service import AsrService
+            from .services.scheduler_service import SchedulerService
+            from .services.user_settings_service import UserSettingsService
+            from .services.calendar_service import CalendarService
 
+            self.scheduler_service = SchedulerService()
             self.calendar_service = CalendarService()
-            self.services.append(self.calendar_service)
-
             self.user_settings_service = UserSettingsService()
-            self.services.append(self.user_settings_service)
-
             self.search_service = SearchService()
-            self.services.append(self.search_service)
-
             self.asr_service = AsrService()
-            self.services.append(self.asr_service)
 
             self.ai_service = AiService(
                 search_service=self.search_service,
                 user_settings_service=self.user_settings_service
             )
-            self.services.append(self.ai_service)
-
             self.event_service = EventService(
                 user_settings_service=self.user_settings_service,
                 calendar_service=self.calendar_service,
             )
-            self.services.append(self.event_service)
 
             self.user_bot = UserBot(
                 ai_service=self.ai_service,
@@ -72,17 +72,30 @@ class Application:
                 user_settings_service=self.user_settings_service,
                 asr_service=self.asr_service,
             )
-            self.services.append(self.user_bot)
 
-            # bot should be last
             self.bot = TelegramBot(
                 user_settings_service=self.user_settings_service,
                 event_service=self.event_service,
             )
-            self.services.append(self.bot)
 
-            for service in self.services:
-                await service.initialize()
+            # Services within a tier are independent and are initialized and
+            # started concurrently; bot should be last
+            self.service_tiers = [
+                [
+                    self.scheduler_service,
+                    self.calendar_service,
+                    self.user_settings_service,
+                    self.search_service,
+                    self.asr_service,
+                ],
+                [self.ai_service, self.event_service],
+                [self.user_bot],
+                [self.bot],
+            ]
+            self.services = [service for tier in self.service_tiers for service in tier]
+
+            for tier in self.service_tiers:
+                await asyncio.gather(*(service.initialize() for service in tier))
 
             logger.info("All services successfuly initiated")
 
@@ -94,8 +107,8 @@ class Application:
         try:
             logger.info("Starting telegram bot services...")
 
-            for service in self.services:
-                await service.start()
+            for tier in self.service_tiers:
+                await asyncio.gather(*(service.start() for service in tier))
 
         except Exception as e:
             logger.error(f"Failed to start services: {e}")
@@ -124,11 +137,30 @@ async def main():
     logger.info("Starting telegram bot...")
     logger.info(f"Log level: {settings.log_level}")
 
+    app = Application()
+
+    # Stop on SIGTERM (docker stop) / SIGINT and still run the cleanup below
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_event.set)
+
     try:
-        app = Application()
         await app.initialize_services()
 
-        await app.start_services()
+        run_task = asyncio.create_task(app.start_services())
+        stop_task = asyncio.create_task(stop_event.wait())
+        done, pending = await asyncio.wait(
+            {run_task, stop_task},
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if stop_task in done:
+            logger.info("Shutdown signal received")
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if run_task in done:
+            run_task.result()
     except Exception as e:
         logger.error(f"Unexpected error in main: {e}")
     finally:
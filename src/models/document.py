@@ -13,7 +13,6 @@ class AstroDocument(Model):
 
     class Meta:
         table = "astro_documents"
-        ordering = ["-created_at"]
 
     def __str__(self) -> str:
         preview = self.content[:50] if self.content else ""
@@ -21,7 +20,8 @@ class AstroDocument(Model):
 
     @classmethod
     async def get_latest(cls):
-        return await cls.all().order_by("-created_at").first()
+        """Most recently refreshed document; unchanged documents are re-stamped on refresh."""
+        return await cls.all().order_by("-updated_at").first()
 
     @classmethod
     async def delete_all(cls):
@@ -29,16 +29,14 @@ class AstroDocument(Model):
 
     @classmethod
     async def is_outdated(cls, days: int = 7) -> bool:
-        latest = await cls.get_latest()
-        if not latest:
+        # Only the timestamp is fetched, not the TEXT content column
+        updated_at = await cls.all().order_by("-updated_at").first().values_list("updated_at", flat=True)
+        if updated_at is None:
             return True
 
-        now = datetime.now(timezone.utc)
-        created_at = latest.created_at
-        
-        if created_at.tzinfo is None:
-            created_at = created_at.replace(tzinfo=timezone.utc)
-        
-        age_days = (now - created_at).days
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+
+        age_days = (datetime.now(timezone.utc) - updated_at).days
         return age_days >= days
 
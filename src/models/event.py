@@ -1,9 +1,11 @@
-import pytz
 from datetime import datetime
-from typing import List, Optional
+from functools import cached_property
+from typing import List, Optional, Set
 from tortoise import fields
 from tortoise.models import Model
 
+from ..utils.timezones import UTC
+
 
 class Event(Model):
     id = fields.IntField(pk=True)
@@ -43,14 +45,12 @@ class Event(Model):
 
     @property
     def is_overdue(self) -> bool:
-        now = datetime.utcnow()
-
-        if self.event_datetime.tzinfo is not None and now.tzinfo is None:
-            now = pytz.UTC.localize(now)
-        elif self.event_datetime.tzinfo is None and now.tzinfo is not None:
-            now = now.replace(tzinfo=None)
+        # Naive datetimes are stored in UTC
+        event_datetime = self.event_datetime
+        if event_datetime.tzinfo is None:
+            event_datetime = event_datetime.replace(tzinfo=UTC)
 
-        return now > self.event_datetime and not self.is_completed
+        return datetime.now(UTC) > event_datetime and not self.is_completed
 
     @property
     def duration_minutes(self) -> Optional[int]:
@@ -59,12 +59,18 @@ class Event(Model):
             return int(delta.total_seconds() / 60)
         return None
 
+    @cached_property
+    def _sent_set(self) -> Set[int]:
+        return set(self.sent_reminders)
+
     def get_pending_reminders(self) -> List[int]:
-        return [time for time in self.reminder_times if time not in self.sent_reminders]
+        sent = self._sent_set
+        return [time for time in self.reminder_times if time not in sent]
 
     def mark_reminder_sent(self, reminder_time: int) -> None:
-        if reminder_time not in self.sent_reminders:
+        if reminder_time not in self._sent_set:
             self.sent_reminders.append(reminder_time)
+            self.__dict__.pop("_sent_set", None)
 
     async def mark_completed(self) -> None:
         self.is_completed = True
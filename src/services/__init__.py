@@ -1,8 +1,5 @@
-from .ai_service import AiService
-from .calendar_service import CalendarService
-from .event_service import EventService
-from .scheduler_service import SchedulerService
-from .search_service import SearchService
+from importlib import import_module
+
 from .service import Service
 
 __all__ = [
@@ -14,3 +11,19 @@ __all__ = [
     "SearchService",
 ]
 
+# Heavy services (LLM, FAISS, Google API, HTTP clients) load on first access,
+# so importing a single submodule does not pull in all of them
+_LAZY_SERVICES = {
+    "AiService": ".ai_service",
+    "CalendarService": ".calendar_service",
+    "EventService": ".event_service",
+    "SchedulerService": ".scheduler_service",
+    "SearchService": ".search_service",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_SERVICES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module, __name__), name)
@@ -1,41 +1,129 @@
+import asyncio
+import hashlib
 import json
-import pytz
-from datetime import datetime
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone as dt_timezone, tzinfo
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Dict, Any, Tuple
 
+import faiss
+import httpx
+import numpy as np
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import DistanceStrategy
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
+from tortoise.transactions import in_transaction
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; its JSONDecodeError subclasses the stdlib one
+    from json import loads as json_loads
 
 from ..config.settings import settings
 from ..models import AstroDocument
 from ..utils.logger import setup_logger
+from ..utils.timezones import UTC, tz
 from .search_service import SearchService
 from .service import Service
 from .user_settings_service import UserSettingsService
 
 logger = setup_logger(__name__)
 
+# HNSW graph parameters for the astro chunks index; vectors are L2-normalized so
+# inner product equals cosine similarity
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# System prompts live in prompts/*.txt and are read on first use
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+
+
+@lru_cache(maxsize=None)
+def _load_prompt(name: str) -> str:
+    return (PROMPTS_DIR / f"{name}.txt").read_text(encoding="utf-8")
+
 
 class OpenRouterEmbeddings(Embeddings):
+    # Texts per embeddings request; large indexes are embedded in concurrent mini-batches
+    batch_size = 64
 
     def __init__(self, api_key: str, model: str, base_url: str):
         super().__init__()
+        # The SDK retries failed requests with exponential backoff, per mini-batch
+        limits = httpx.Limits(max_keepalive_connections=20)
         self.client = OpenAI(
             api_key=api_key,
-            base_url=base_url
+            base_url=base_url,
+            max_retries=5,
+            http_client=httpx.Client(limits=limits)
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=5,
+            http_client=httpx.AsyncClient(limits=limits)
         )
         self.model = model
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        response = self.client.embeddings.create(
-            model=self.model,
-            input=texts,
-            encoding_format="float"
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        return [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+    @staticmethod
+    def _to_matrix(responses) -> np.ndarray:
+        """Pack response embeddings into one (n, d) float32 matrix."""
+        return np.asarray(
+            [item.embedding for response in responses for item in response.data],
+            dtype=np.float32
         )
-        return [item.embedding for item in response.data]
+
+    @staticmethod
+    def _fan_out(texts: List[str], unique: List[str], embeddings: np.ndarray) -> np.ndarray:
+        """Map embeddings of deduplicated texts back onto the original positions."""
+        if len(unique) == len(texts):
+            return embeddings
+        position = {text: i for i, text in enumerate(unique)}
+        return embeddings[[position[text] for text in texts]]
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into an (n, d) float32 matrix, skipping the list conversion for index builds."""
+        # Scraped pages share boilerplate, so identical chunks are embedded once
+        unique = list(dict.fromkeys(texts))
+        responses = [
+            self.client.embeddings.create(
+                model=self.model,
+                input=batch,
+                encoding_format="float"
+            )
+            for batch in self._batches(unique)
+        ]
+        return self._fan_out(texts, unique, self._to_matrix(responses))
+
+    async def aembed_matrix(self, texts: List[str]) -> np.ndarray:
+        """Async variant of embed_matrix with concurrent mini-batches."""
+        unique = list(dict.fromkeys(texts))
+        responses = await asyncio.gather(*(
+            self.async_client.embeddings.create(
+                model=self.model,
+                input=batch,
+                encoding_format="float"
+            )
+            for batch in self._batches(unique)
+        ))
+        return self._fan_out(texts, unique, self._to_matrix(responses))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_matrix(texts).tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return (await self.aembed_matrix(texts)).tolist()
 
     def embed_query(self, text: str) -> List[float]:
         response = self.client.embeddings.create(
@@ -46,6 +134,53 @@ class OpenRouterEmbeddings(Embeddings):
         return response.data[0].embedding
 
 
+class EmbeddingCache:
+    """On-disk store of chunk embeddings addressed by sha256 of the model and text."""
+
+    # Stays under SQLite's bound-parameter limit
+    _SELECT_BATCH = 500
+
+    def __init__(self, path: str, model: str):
+        self.path = path
+        self.model = model
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash TEXT PRIMARY KEY, vec BLOB NOT NULL)")
+        return conn
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        keys = {self._key(text): text for text in texts}
+        hashes = list(keys)
+        found = {}
+
+        with closing(self._connect()) as conn:
+            for i in range(0, len(hashes), self._SELECT_BATCH):
+                batch = hashes[i:i + self._SELECT_BATCH]
+                rows = conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({','.join('?' * len(batch))})",
+                    batch
+                )
+                for key, blob in rows:
+                    found[keys[key]] = np.frombuffer(blob, dtype=np.float32)
+
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)",
+                [
+                    (self._key(text), vector.astype(np.float32, copy=False).tobytes())
+                    for text, vector in vectors.items()
+                ]
+            )
+
+
 class AiService(Service):
     def __init__(self, search_service: SearchService, user_settings_service: UserSettingsService):
         super().__init__(logger)
@@ -55,32 +190,41 @@ class AiService(Service):
         self.vector_store = None
         self.chunk_size = 1000
         self.chunk_overlap = 200
-        self.llm_client = OpenAI(
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            length_function=len,
+            separators=["\n\n", "\n", " ", ""]
+        )
+        self.llm_client = AsyncOpenAI(
             api_key=settings.openai_api_key,
             base_url="https://openrouter.ai/api/v1"
         )
+        # One embeddings client (and HTTP connection pool) for index loads and rebuilds
+        self.embeddings = OpenRouterEmbeddings(
+            api_key=settings.openai_api_key,
+            model="qwen/qwen3-embedding-8b",
+            base_url="https://openrouter.ai/api/v1"
+        )
+        # Lives next to the index so it shares its volume and survives rebuilds
+        self.embedding_cache = EmbeddingCache(
+            os.path.join(self.faiss_index_path, "embeddings_cache.sqlite3"),
+            model=self.embeddings.model
+        )
 
     async def initialize(self):
         await super().initialize()
         await self.load_faiss_index()
 
-    def _clean_json_response(self, content: str) -> str:
-        """
-        Очищает ответ LLM от markdown форматирования
-        Удаляет ```json и ``` блоки, если они есть
-        """
-        content = content.strip()
-
-        # Удаляем markdown блоки
-        if content.startswith("```json"):
-            content = content[7:]  # Убираем ```json
-        elif content.startswith("```"):
-            content = content[3:]  # Убираем ```
+    async def stop(self):
+        await super().stop()
+        await self.llm_client.close()
+        self.embeddings.client.close()
+        await self.embeddings.async_client.close()
 
-        if content.endswith("```"):
-            content = content[:-3]  # Убираем закрывающие ```
-
-        return content.strip()
+    @staticmethod
+    def _content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
     async def update_database(self, force: bool = False):
         try:
@@ -92,25 +236,49 @@ class AiService(Service):
 
             self.logger.info("Astro documents are outdated, updating...")
 
-            await AstroDocument.delete_all()
-            self.logger.info("Deleted all old documents")
-
             query = f"Астрологический календарь на неделю {datetime.now().strftime('%d.%m.%Y')}"
-            doc_count = 0
+            fetched = {
+                self._content_hash(doc_data['content']): doc_data['content']
+                async for doc_data in self.search_service.search_docs(
+                    query=query,
+                    num_results=5,
+                    fetch_full_content=True
+                )
+            }
 
-            for doc_data in self.search_service.search_docs(
-                query=query,
-                num_results=5,
-                fetch_full_content=True
-            ):
-                content = doc_data['content']
-                await AstroDocument.create(content=content)
-                doc_count += 1
-                self.logger.info(f"Saved document {doc_count}")
+            if not fetched:
+                self.logger.warning("No documents fetched, keeping the existing ones")
+                return
 
-            self.logger.info(f"Successfully updated database with {doc_count} documents")
+            # Only changed documents are written; unchanged ones are just marked fresh
+            existing: Dict[str, int] = {}
+            stale_ids: List[int] = []
+            for doc_id, content in await AstroDocument.all().values_list("id", "content"):
+                content_hash = self._content_hash(content)
+                if content_hash in fetched and content_hash not in existing:
+                    existing[content_hash] = doc_id
+                else:
+                    # Documents no longer fetched and duplicates of a kept one are removed
+                    stale_ids.append(doc_id)
+            kept_ids = list(existing.values())
+            new_contents = [content for content_hash, content in fetched.items() if content_hash not in existing]
+
+            async with in_transaction():
+                if stale_ids:
+                    await AstroDocument.filter(id__in=stale_ids).delete()
+                if kept_ids:
+                    await AstroDocument.filter(id__in=kept_ids).update(updated_at=datetime.now(dt_timezone.utc))
+                if new_contents:
+                    await AstroDocument.bulk_create(
+                        [AstroDocument(content=content) for content in new_contents],
+                        batch_size=500
+                    )
+
+            self.logger.info(
+                f"Updated documents: {len(new_contents)} new, {len(stale_ids)} removed, {len(kept_ids)} unchanged"
+            )
 
-            if doc_count > 0:
+            if stale_ids or new_contents or self.vector_store is None:
                 self.logger.info("Creating FAISS vector store...")
                 await self._create_faiss_index()
                 self.logger.info("FAISS vector store created successfully")
@@ -122,8 +290,6 @@ class AiService(Service):
 
     async def load_faiss_index(self):
         """Загрузка FAISS индекса из файла."""
-        import os
-
         try:
             if not os.path.exists(self.faiss_index_path):
                 self.logger.warning(f"FAISS index not found at {self.faiss_index_path}, will create on first update")
@@ -131,18 +297,20 @@ class AiService(Service):
 
             self.logger.info(f"Loading FAISS index from {self.faiss_index_path}")
 
-            embeddings = OpenRouterEmbeddings(
-                api_key=settings.openai_api_key,
-                model="qwen/qwen3-embedding-8b",
-                base_url="https://openrouter.ai/api/v1"
-            )
-
             self.vector_store = FAISS.load_local(
                 self.faiss_index_path,
-                embeddings,
-                allow_dangerous_deserialization=True
+                self.embeddings,
+                allow_dangerous_deserialization=True,
+                normalize_L2=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
             )
 
+            if not isinstance(self.vector_store.index, faiss.IndexHNSWFlat):
+                self.logger.info("FAISS index uses the old flat layout, rebuilding as HNSW")
+                await self._create_faiss_index()
+                return
+
+            self.vector_store.index.hnsw.efSearch = HNSW_EF_SEARCH
             self.logger.info("FAISS index loaded successfully")
 
         except Exception as e:
@@ -153,21 +321,14 @@ class AiService(Service):
         """Разбиение документов на чанки с перекрытием."""
         self.logger.info(f"Splitting {len(documents)} documents into chunks (size={self.chunk_size}, overlap={self.chunk_overlap})")
 
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
-
-        chunks = text_splitter.split_documents(documents)
+        chunks = self.text_splitter.split_documents(documents)
         self.logger.info(f"Created {len(chunks)} chunks from {len(documents)} documents")
 
         return chunks
 
     async def _create_faiss_index(self):
         try:
-            documents = await AstroDocument.all().order_by('-created_at')
+            documents = await AstroDocument.all()
 
             if not documents:
                 self.logger.warning("No documents found for FAISS indexing")
@@ -194,13 +355,18 @@ class AiService(Service):
 
             self.logger.info(f"Creating embeddings for {len(chunks)} chunks...")
 
-            embeddings = OpenRouterEmbeddings(
-                api_key=settings.openai_api_key,
-                model="qwen/qwen3-embedding-8b",
-                base_url="https://openrouter.ai/api/v1"
-            )
-
-            self.vector_store = FAISS.from_documents(chunks, embeddings)
+            # Only chunks never embedded before go to the API
+            texts = [chunk.page_content for chunk in chunks]
+            known = await asyncio.to_thread(self.embedding_cache.get_many, texts)
+            missing = [text for text in dict.fromkeys(texts) if text not in known]
+            self.logger.info(f"Embedding cache: {len(known)} hits, {len(missing)} misses")
+            if missing:
+                fresh = dict(zip(missing, await self.embeddings.aembed_matrix(missing)))
+                await asyncio.to_thread(self.embedding_cache.put_many, fresh)
+                known.update(fresh)
+
+            vectors = np.vstack([known[text] for text in texts])
+            self.vector_store = self._build_vector_store(chunks, vectors, self.embeddings)
             self.vector_store.save_local(self.faiss_index_path)
 
             self.logger.info(f"FAISS index with {len(chunks)} chunks saved to {self.faiss_index_path}")
@@ -209,6 +375,30 @@ class AiService(Service):
             self.logger.error(f"Failed to create FAISS index: {e}")
             raise
 
+    def _build_vector_store(
+        self,
+        chunks: List[Document],
+        vectors: np.ndarray,
+        embeddings: Embeddings
+    ) -> FAISS:
+        """Построение HNSW индекса по косинусной близости вместо плоского L2 перебора."""
+        faiss.normalize_L2(vectors)
+
+        index = faiss.IndexHNSWFlat(vectors.shape[1], HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        index.add(vectors)
+
+        ids = [str(i) for i in range(len(chunks))]
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=InMemoryDocstore(dict(zip(ids, chunks))),
+            index_to_docstore_id=dict(enumerate(ids)),
+            normalize_L2=True,
+            distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+        )
+
     def search_similar_chunks(self, query: str, k: int = 5) -> List[Document]:
         if not self.vector_store:
             self.logger.warning("FAISS index not loaded, cannot search")
@@ -230,79 +420,49 @@ class AiService(Service):
             self.logger.error(f"Failed to search in FAISS index: {e}")
             return []
 
-    async def _get_owner_settings_with_timezone(self) -> Tuple["UserSettings", str, pytz.BaseTzInfo]:
+    async def _get_owner_settings_with_timezone(self) -> Tuple["UserSettings", str, tzinfo]:
         owner_settings = await self.user_settings_service.get_owner_settings()
         timezone_name = owner_settings.timezone or settings.timezone
-        timezone = pytz.timezone(timezone_name)
+        timezone = tz(timezone_name)
         return owner_settings, timezone_name, timezone
 
     async def _ai_parse_datetime_and_name(
         self,
         text: str,
         timezone_name: str,
-        timezone: pytz.BaseTzInfo
+        timezone: tzinfo
     ) -> Dict[str, Any]:
         """Использование LLM для парсинга даты, времени и названия события."""
 
-        system_prompt = """Ты - ассистент для парсинга дат и времени. Твоя задача - извлекать информацию о событии из текста на естественном языке.
-
-Текущий часовой пояс: {timezone}
-Текущее время: {current_time}
-
-Распарси текст и верни JSON объект со следующей структурой:
-{{
-    "start_datetime": "YYYY-MM-DD HH:MM:SS",  // Дата и время начала в ISO формате
-    "end_datetime": "YYYY-MM-DD HH:MM:SS",    // Опционально, только если указан временной диапазон
-    "event_name": "Название события",          // Название/заголовок события
-    "description": "Описание"                  // Опциональное описание
-}}
-
-Правила:
-1. Всегда возвращай валидный JSON
-2. Используй 24-часовой формат для времени
-3. Если конкретное время не указано, используй текущее время
-4. Если конкретная дата не указана, используй сегодня
-5. Для относительного времени типа "через 2 часа", рассчитывай от текущего времени
-6. Для дней недели типа "пятница", используй следующее вхождение
-7. Для "следующий понедельник", используй понедельник следующей недели
-8. Если указан временной диапазон (например, "с 14 до 16"), устанавливай оба времени
-9. Держи названия событий краткими но описательными
-10. Если четкое название события не найдено, используй "Без названия"
-
-Примеры:
-- "завтра в 15:00 Встреча с командой" → {{"start_datetime": "2024-01-16 15:00:00", "event_name": "Встреча с командой"}}
-- "пятница с 14:00 до 16:00 Презентация клиенту" → {{"start_datetime": "2024-01-19 14:00:00", "end_datetime": "2024-01-19 16:00:00", "event_name": "Презентация клиенту"}}
-- "через 2 часа Обзор проекта" → {{"start_datetime": "2024-01-15 17:30:00", "event_name": "Обзор проекта"}}
-- "следующий понедельник в 10:00 Встреча" → {{"start_datetime": "2024-01-22 10:00:00", "event_name": "Встреча"}}
-- "tomorrow 3pm Team Meeting" → {{"start_datetime": "2024-01-16 15:00:00", "event_name": "Team Meeting"}}
-
-Возвращай только JSON объект, ничего больше."""
-
-        current_time = datetime.now(timezone)
-        formatted_system_prompt = system_prompt.format(
-            timezone=timezone_name,
-            current_time=current_time.strftime("%Y-%m-%d %H:%M:%S %Z")
+        current_time = datetime.now(timezone).strftime("%Y-%m-%d %H:%M:%S %Z")
+        formatted_system_prompt = (
+            f"Текущий часовой пояс: {timezone_name}\nТекущее время: {current_time}\n\n"
+            + _load_prompt("parse_event")
         )
 
         try:
-            response = self.llm_client.chat.completions.create(
+            response = await self.llm_client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": formatted_system_prompt},
                     {"role": "user", "content": f"Parse this text: {text}"}
                 ],
                 temperature=0.1,
-                max_tokens=10000
+                max_tokens=10000,
+                response_format={"type": "json_object"}
             )
 
             content = response.choices[0].message.content
             self.logger.info(f"AI response: {content}")
 
-            # Очищаем ответ от markdown форматирования
-            cleaned_content = self._clean_json_response(content)
-            parsed_data = json.loads(cleaned_content)
+            parsed_data = json_loads(content)
+            # The output is not schema-bound, so "false" may come back as a string
+            is_event = parsed_data.get('is_event', False)
+            if isinstance(is_event, str):
+                is_event = is_event.strip().lower() == 'true'
+            parsed_data['is_event'] = is_event is True
 
-            if 'start_datetime' not in parsed_data:
+            if parsed_data['is_event'] and 'start_datetime' not in parsed_data:
                 raise ValueError("AI response missing start_datetime")
 
             return parsed_data
@@ -314,20 +474,20 @@ class AiService(Service):
             self.logger.error(f"LLM API error: {e}")
             raise ValueError(f"AI parsing failed: {e}")
 
-    def _validate_and_convert_datetime(self, datetime_str: str, timezone: pytz.BaseTzInfo) -> datetime:
+    def _validate_and_convert_datetime(self, datetime_str: str, timezone: tzinfo) -> datetime:
         """Валидация и конвертация строки datetime в timezone-aware объект."""
         if not datetime_str or datetime_str.strip() == "":
             self.logger.warning("Empty datetime string, using current time")
             now = datetime.now(timezone)
-            return now.astimezone(pytz.UTC)
+            return now.astimezone(UTC)
 
         try:
             dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
 
             if dt.tzinfo is None:
-                dt = timezone.localize(dt)
+                dt = dt.replace(tzinfo=timezone)
 
-            return dt.astimezone(pytz.UTC)
+            return dt.astimezone(UTC)
 
         except Exception as e:
             self.logger.error(f"Failed to validate datetime '{datetime_str}': {e}")
@@ -380,19 +540,21 @@ class AiService(Service):
             astro_prompt = self._create_astro_analysis_prompt(event_data, context)
 
             self.logger.info("Requesting astro analysis from LLM...")
-            response = self.llm_client.chat.completions.create(
+            response = await self.llm_client.chat.completions.create(
                 model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": astro_prompt}],
+                messages=[
+                    {"role": "system", "content": _load_prompt("astro_analysis")},
+                    {"role": "user", "content": astro_prompt}
+                ],
                 temperature=0.3,
                 max_tokens=2000,
+                response_format={"type": "json_object"}
             )
 
             astro_response = response.choices[0].message.content
-            self.logger.info(f"Received astro analysis raw: {astro_response}")
+            self.logger.info(f"Received astro analysis: {astro_response}")
 
-            cleaned_response = self._clean_json_response(astro_response)
-            self.logger.info(f"Cleaned astro analysis: {cleaned_response}")
-            astro_analysis = json.loads(cleaned_response)
+            astro_analysis = json_loads(astro_response)
 
             event_data['result'] = astro_analysis.get('result', 'OK')
             event_data['message'] = "🔮 Астрологический совет:\n" + astro_analysis.get('message', "")
@@ -407,56 +569,14 @@ class AiService(Service):
             return event_data
 
 
-    async def _ai_classify_is_event(self, text: str) -> dict:
-        """
-        Классифицирует текст: является ли он запросом на создание события.
-        Возвращает JSON: { "is_event": true/false, "reason": "..." }
-        """
-        prompt = f"""
-    Ты — помощник, который определяет, содержит ли текст запрос на создание события / встречи / задачи.
-
-    Верни JSON строго в формате:
-    {{
-        "is_event": true/false,
-        "reason": "краткое объяснение"
-    }}
-
-    Текст: "{text}"
-
-    Правила:
-    - is_event = true, если пользователь хочет назначить встречу, событие, задачу, напоминание.
-    - is_event = false, если текст — просто разговор, вопрос, приветствие, мнение и т.п.
-    - Если есть даже слабый намёк на “назначить”, “встретиться”, “позвонить”, “записаться”, “через 2 часа ...”, — ставь true.
-    - Всегда возвращай валидный JSON.
-    """
-
-        try:
-            response = self.llm_client.chat.completions.create(
-                model="openai/gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=200
-            )
-
-            content = response.choices[0].message.content
-            cleaned = self._clean_json_response(content)
-            data = json.loads(cleaned)
-            is_event = bool(data.get("is_event", False))
-            self.logger.info(f"Event classification for '{text}': {is_event}")
-            return is_event
-        except Exception as e:
-            self.logger.error(f"Failed to classify text as event/non-event: {e}")
-            # В случае ошибки классификации лучше ничего не делать, чем ломать логику
-            return False
-
     def _create_astro_analysis_prompt(self, event_data: dict, astro_context: str) -> str:
-        """Создание промпта для астрологического анализа события."""
+        """Создание пользовательской части промпта для астрологического анализа события."""
 
         event_datetime = event_data['event_datetime']
         event_name = event_data['event_name']
         event_description = event_data.get('description', '')
         timezone_name = event_data.get('timezone', settings.timezone)
-        timezone = pytz.timezone(timezone_name)
+        timezone = tz(timezone_name)
 
         # Форматируем дату и время
         local_datetime = event_datetime.astimezone(timezone)
@@ -464,9 +584,7 @@ class AiService(Service):
         time_str = local_datetime.strftime('%H:%M')
         weekday_str = local_datetime.strftime('%A')
 
-        prompt = f"""Ты — профессиональный астролог. На основе предоставленного астрологического контекста дай краткий совет о планируемом событии.
-
-ИНФОРМАЦИЯ О СОБЫТИИ:
+        prompt = f"""ИНФОРМАЦИЯ О СОБЫТИИ:
 Название: {event_name}
 Дата: {date_str} ({weekday_str})
 Время: {time_str}
@@ -474,40 +592,6 @@ class AiService(Service):
 
 АСТРОЛОГИЧЕСКИЙ КОНТЕКСТ:
 {astro_context}
-
-ЗАДАЧА:
-Проанализируй благоприятность этого времени для запланированного события на основе астрологического контекста.
-
-Твой ответ должен быть:
-1. Кратким (2-4 предложения)
-2. Конкретным (относиться именно к этому событию и времени)
-3. Практичным (давать конкретные рекомендации)
-4. Основанным на предоставленном астрологическом контексте
-5. Дружелюбным и понятным (избегай сложных астрологических терминов, пиши простым языком)
-6. Позитивным и поддерживающим (даже если время не идеально)
-7. Если время не подходит, то обязательно предложи другое время или дату
-
-Не повторяй информацию о событии, сразу переходи к астрологическому анализу.
-
-Всегда стремись найти позитивные аспекты и считать время скорее подходящим, если контекст не указывает на явные риски. 
-
-
-Верни ответ в формате JSON со следующей структурой:
-{{
-    "result": "OK/BAD",
-    "message": "Астрологические рекомендации"
-}}
-result может быть только OK или BAD, если время подходит, то OK, если нет, то BAD
-message может быть пустым
-
-Примеры:
-- {{"result": "OK", "message": "Астрологический совет: это хорошее время для этого события"}}
-- {{"result": "BAD", "message": "Согласно гороскопу, неделя с 3 по 9 ноября 2025 года для знака Водолей не описана,
-    но для знака Скорпион эта неделя — время мудрости и заботы о себе, рекомендуется слушать своё сердце и не усложнять задачи.
-    Это может говорить о том, что сейчас не самое благоприятное время для важных встреч, требующих концентрации и принятия решений.
-    Напутствие: попробуйте перенести встречу на более благоприятное время, например, на следующую неделю."}}
-- {{"result": "OK", "message": "Астрологический совет: Завтрашние транзиты выглядят спокойными — даже если день в целом кажется энергически неровным, в вашей личной конфигурации нет напряжённых аспектов, которые могли бы помешать встрече. Влияние планет скорее нейтральное, так что смело назначайте событие: время обещает пройти устойчиво и без неприятных сюрпризов."}}
-
 """
 
         return prompt
@@ -524,11 +608,6 @@ message может быть пустым
 
             self.logger.info(f"Text after removing ++event prefix: '{text}'")
 
-            is_event = await self._ai_classify_is_event(text)
-            if not is_event:
-                self.logger.info("Text is not classified as event, doing nothing")
-                return None
-
             # TODO somewhere here you can fetch owner's birthday and use it to calculate the best time for the event
             owner_settings, timezone_name, timezone = await self._get_owner_settings_with_timezone()
 
@@ -544,7 +623,11 @@ message может быть пустым
             if not reminder_times:
                 reminder_times = list(owner_settings.default_reminder_times)
 
+            # One LLM call both classifies the text and parses the event
             parsed_data = await self._ai_parse_datetime_and_name(text, timezone_name, timezone)
+            if not parsed_data['is_event']:
+                self.logger.info("Text is not classified as event, doing nothing")
+                return None
 
             event_datetime = self._validate_and_convert_datetime(parsed_data.get('start_datetime'), timezone)
             end_datetime = None
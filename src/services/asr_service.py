@@ -1,3 +1,4 @@
+import asyncio
 from pathlib import Path
 from deepgram import AsyncDeepgramClient
 
@@ -23,7 +24,8 @@ class AsrService(Service):
         pass
 
     async def transcribe_file(self, path: Path) -> str:
-        audio_bytes = path.read_bytes()
+        # Disk read happens off the event loop
+        audio_bytes = await asyncio.to_thread(path.read_bytes)
 
         response = await self._client.listen.v1.media.transcribe_file(
             request=audio_bytes,
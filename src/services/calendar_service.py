@@ -1,13 +1,15 @@
+import asyncio
 import os
-import pytz
-from datetime import datetime
-from typing import Optional, List
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Optional, List, Tuple
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from ..utils.logger import setup_logger
+from ..utils.timezones import UTC, tz
 from ..config.settings import settings
 from ..models import Event
 from .service import Service
@@ -17,6 +19,14 @@ logger = setup_logger(__name__)
 # Google Calendar API scopes
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
+# Maximum number of calls Google accepts in one batch request
+BATCH_SIZE = 50
+
+# Access tokens are refreshed this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+# Pause before retrying a failed refresh or when the expiry is unknown
+TOKEN_REFRESH_RETRY = 60.0
+
 
 class CalendarService(Service):
     def __init__(self):
@@ -25,6 +35,11 @@ class CalendarService(Service):
         self.calendar_id = settings.google_calendar_id or "primary"
         self.credentials_path = settings.google_calendar_credentials_path
         self.token_path = settings.google_calendar_token_path
+        # httplib2 is not thread-safe, so API calls run off the loop one at a time
+        self._api_lock = asyncio.Lock()
+        self.credentials: Optional[Credentials] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._backfill_task: Optional[asyncio.Task] = None
 
     async def initialize(self):
         await super().initialize()
@@ -38,7 +53,11 @@ class CalendarService(Service):
 
         try:
             creds = self._get_credentials()
+            if creds and creds.expired and creds.refresh_token:
+                self.credentials = creds
+                await self._refresh_credentials()
             if creds and creds.valid:
+                self.credentials = creds
                 self.service = build('calendar', 'v3', credentials=creds)
                 logger.info("Google Calendar service initialized successfully")
             else:
@@ -66,7 +85,7 @@ class CalendarService(Service):
             logger.warning(f"Failed to load token from {self.token_path}: {e}")
             return None
 
-        if creds and not creds.valid:
+        if creds and not creds.valid and not (creds.expired and creds.refresh_token):
             logger.warning(
                 "Google Calendar token is invalid and cannot be refreshed. "
                 "Run the authentication script: scripts/calendar/setup_auth.sh"
@@ -75,6 +94,74 @@ class CalendarService(Service):
 
         return creds
 
+    async def start(self):
+        await super().start()
+        if self.service and self.credentials and self.credentials.refresh_token:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+        if self.service:
+            # Runs in the background so later startup tiers do not wait on the Calendar API
+            self._backfill_task = asyncio.create_task(self._sync_pending_events())
+
+    async def stop(self):
+        await super().stop()
+        if self._backfill_task:
+            self._backfill_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._backfill_task
+            self._backfill_task = None
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+
+    async def _sync_pending_events(self) -> None:
+        """Push upcoming events that never reached the calendar (created while sync was down)."""
+        try:
+            events = await Event.filter(
+                calendar_event_id=None,
+                is_completed=False,
+                is_cancelled=False,
+                event_datetime__gte=datetime.now(UTC)
+            )
+            if events:
+                await self.sync_events(events)
+        except Exception as e:
+            logger.error(f"Failed to sync pending events to Google Calendar: {e}")
+
+    async def _refresh_credentials(self) -> None:
+        """Refresh the access token in place and persist it; the built service picks it up."""
+        async with self._api_lock:
+            await asyncio.to_thread(self._refresh_and_save_credentials)
+        logger.info(f"Google Calendar token refreshed, valid until {self.credentials.expiry}")
+
+    def _refresh_and_save_credentials(self) -> None:
+        self.credentials.refresh(Request())
+        try:
+            with open(self.token_path, 'w') as token_file:
+                token_file.write(self.credentials.to_json())
+        except OSError as e:
+            logger.warning(f"Failed to save refreshed token to {self.token_path}: {e}")
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            delay = TOKEN_REFRESH_RETRY
+            if self.credentials.expiry:
+                # google-auth keeps expiry as naive UTC, so compare against naive UTC now
+                refresh_at = self.credentials.expiry - TOKEN_REFRESH_MARGIN
+                now = datetime.now(UTC).replace(tzinfo=None)
+                delay = max((refresh_at - now).total_seconds(), TOKEN_REFRESH_RETRY)
+            await asyncio.sleep(delay)
+
+            try:
+                await self._refresh_credentials()
+            except Exception as e:
+                logger.error(f"Failed to refresh Google Calendar token: {e}")
+
+    async def _execute(self, request):
+        async with self._api_lock:
+            return await asyncio.to_thread(request.execute)
+
     def _convert_reminders(self, reminder_times: List[int]) -> dict:
         reminders = []
 
@@ -94,63 +181,68 @@ class CalendarService(Service):
 
     def _format_datetime_for_google(self, dt: datetime, timezone_str: str) -> str:
         if dt.tzinfo is None:
-            tz = pytz.timezone(timezone_str)
-            dt = tz.localize(dt)
+            dt = dt.replace(tzinfo=tz(timezone_str))
 
         return dt.isoformat()
 
-    async def create_event(self, event: Event) -> Optional[str]:
+    def _build_event_body(self, event: Event) -> dict:
+        start_datetime = self._format_datetime_for_google(
+            event.event_datetime,
+            event.timezone
+        )
+
+        if event.end_datetime:
+            end_datetime = self._format_datetime_for_google(
+                event.end_datetime,
+                event.timezone
+            )
+        else:
+            end_datetime = self._format_datetime_for_google(
+                event.event_datetime + timedelta(hours=1),
+                event.timezone
+            )
+
+        event_body = {
+            'summary': event.event_name,
+            'start': {
+                'dateTime': start_datetime,
+                'timeZone': event.timezone,
+            },
+            'end': {
+                'dateTime': end_datetime,
+                'timeZone': event.timezone,
+            },
+            'description': event.description or '',
+        }
+
+        if event.location:
+            event_body['location'] = event.location
+
+        if event.reminder_times:
+            event_body['reminders'] = self._convert_reminders(event.reminder_times)
+
+        return event_body
+
+    async def create_event(self, event: Event) -> Optional[Tuple[str, str]]:
+        """Insert the event and return its (event_id, html_link) from the insert response."""
         if not self.service:
             logger.warning("Google Calendar service not initialized. Skipping event creation.")
             return None
 
         try:
-            start_datetime = self._format_datetime_for_google(
-                event.event_datetime,
-                event.timezone
-            )
+            event_body = self._build_event_body(event)
 
-            if event.end_datetime:
-                end_datetime = self._format_datetime_for_google(
-                    event.end_datetime,
-                    event.timezone
-                )
-            else:
-                end_datetime = self._format_datetime_for_google(
-                    event.event_datetime.replace(hour=event.event_datetime.hour + 1),
-                    event.timezone
-                )
-
-            event_body = {
-                'summary': event.event_name,
-                'start': {
-                    'dateTime': start_datetime,
-                    'timeZone': event.timezone,
-                },
-                'end': {
-                    'dateTime': end_datetime,
-                    'timeZone': event.timezone,
-                },
-                'description': event.description or '',
-            }
-
-            if event.location:
-                event_body['location'] = event.location
-
-            if event.reminder_times:
-                event_body['reminders'] = self._convert_reminders(event.reminder_times)
-
-            created_event = self.service.events().insert(
+            created_event = await self._execute(self.service.events().insert(
                 calendarId=self.calendar_id,
                 body=event_body
-            ).execute()
+            ))
 
             event_id = created_event.get('id')
-            event_url = created_event.get('htmlLink')
+            event_url = created_event.get('htmlLink', '')
 
             logger.info(f"Created Google Calendar event: {event_id} for event {event.id}")
 
-            return event_id
+            return event_id, event_url
 
         except HttpError as e:
             logger.error(f"HTTP error creating Google Calendar event: {e}")
@@ -159,74 +251,39 @@ class CalendarService(Service):
             logger.error(f"Failed to create Google Calendar event: {e}")
             return None
 
-    async def update_event(self, event: Event) -> bool:
+    async def update_event(self, event: Event) -> Optional[str]:
+        """Patch the event's managed fields and return its html_link, or None on failure."""
         if not self.service:
             logger.warning("Google Calendar service not initialized. Skipping event update.")
-            return False
+            return None
 
         if not event.calendar_event_id:
             logger.warning(f"Event {event.id} has no calendar_event_id. Cannot update.")
-            return False
+            return None
 
         try:
-            existing_event = self.service.events().get(
-                calendarId=self.calendar_id,
-                eventId=event.calendar_event_id
-            ).execute()
+            # Patch only sends the managed fields; an empty location clears a stale one
+            event_body = self._build_event_body(event)
+            event_body.setdefault('location', '')
 
-            start_datetime = self._format_datetime_for_google(
-                event.event_datetime,
-                event.timezone
-            )
-
-            if event.end_datetime:
-                end_datetime = self._format_datetime_for_google(
-                    event.end_datetime,
-                    event.timezone
-                )
-            else:
-                end_datetime = self._format_datetime_for_google(
-                    event.event_datetime.replace(hour=event.event_datetime.hour + 1),
-                    event.timezone
-                )
-
-            existing_event['summary'] = event.event_name
-            existing_event['description'] = event.description or ''
-            existing_event['start'] = {
-                'dateTime': start_datetime,
-                'timeZone': event.timezone,
-            }
-            existing_event['end'] = {
-                'dateTime': end_datetime,
-                'timeZone': event.timezone,
-            }
-
-            if event.location:
-                existing_event['location'] = event.location
-            elif 'location' in existing_event:
-                existing_event['location'] = ''
-
-            if event.reminder_times:
-                existing_event['reminders'] = self._convert_reminders(event.reminder_times)
-
-            updated_event = self.service.events().update(
+            updated_event = await self._execute(self.service.events().patch(
                 calendarId=self.calendar_id,
                 eventId=event.calendar_event_id,
-                body=existing_event
-            ).execute()
+                body=event_body
+            ))
 
             logger.info(f"Updated Google Calendar event {event.calendar_event_id} for event {event.id}")
-            return True
+            return updated_event.get('htmlLink', '')
 
         except HttpError as e:
             if e.resp.status == 404:
                 logger.warning(f"Google Calendar event {event.calendar_event_id} not found. It may have been deleted.")
             else:
                 logger.error(f"HTTP error updating Google Calendar event: {e}")
-            return False
+            return None
         except Exception as e:
             logger.error(f"Failed to update Google Calendar event: {e}")
-            return False
+            return None
 
     async def delete_event(self, event: Event) -> bool:
         if not self.service:
@@ -238,10 +295,10 @@ class CalendarService(Service):
             return False
 
         try:
-            self.service.events().delete(
+            await self._execute(self.service.events().delete(
                 calendarId=self.calendar_id,
                 eventId=event.calendar_event_id
-            ).execute()
+            ))
 
             logger.info(f"Deleted Google Calendar event {event.calendar_event_id} for event {event.id}")
             return True
@@ -259,33 +316,79 @@ class CalendarService(Service):
 
     async def sync_event(self, event: Event) -> bool:
         if event.calendar_event_id:
-            success = await self.update_event(event)
-            if success:
-                try:
-                    existing_event = self.service.events().get(
-                        calendarId=self.calendar_id,
-                        eventId=event.calendar_event_id
-                    ).execute()
-                    event_url = existing_event.get('htmlLink')
-                    if event_url and event_url != event.calendar_url:
-                        event.calendar_url = event_url
-                        await event.save(update_fields=['calendar_url'])
-                except Exception as e:
-                    logger.warning(f"Failed to update calendar URL: {e}")
-            return success
+            event_url = await self.update_event(event)
+            if event_url is None:
+                return False
+            if event_url and event_url != event.calendar_url:
+                event.calendar_url = event_url
+                await event.save(update_fields=['calendar_url'])
+            return True
         else:
-            event_id = await self.create_event(event)
-            if event_id:
-                event.calendar_event_id = event_id
-                try:
-                    created_event = self.service.events().get(
-                        calendarId=self.calendar_id,
-                        eventId=event_id
-                    ).execute()
-                    event.calendar_url = created_event.get('htmlLink', '')
-                except Exception as e:
-                    logger.warning(f"Failed to get calendar URL: {e}")
-
+            created = await self.create_event(event)
+            if created:
+                event.calendar_event_id, event.calendar_url = created
                 await event.save(update_fields=['calendar_event_id', 'calendar_url'])
                 return True
             return False
+
+    async def sync_events(self, events: List[Event]) -> int:
+        """Create or update many events with batched Calendar API requests; returns how many synced."""
+        if not self.service:
+            logger.warning("Google Calendar service not initialized. Skipping batch sync.")
+            return 0
+
+        synced = 0
+        for offset in range(0, len(events), BATCH_SIZE):
+            chunk = events[offset:offset + BATCH_SIZE]
+            responses = {}
+
+            def on_result(request_id, response, exception):
+                if exception is not None:
+                    logger.error(f"Batch sync failed for event {chunk[int(request_id)].id}: {exception}")
+                else:
+                    responses[request_id] = response
+
+            batch = self.service.new_batch_http_request(callback=on_result)
+            queued = 0
+            for i, event in enumerate(chunk):
+                try:
+                    event_body = self._build_event_body(event)
+                except Exception as e:
+                    logger.error(f"Failed to build Google Calendar event body for event {event.id}: {e}")
+                    continue
+                if event.calendar_event_id:
+                    event_body.setdefault('location', '')
+                    request = self.service.events().patch(
+                        calendarId=self.calendar_id,
+                        eventId=event.calendar_event_id,
+                        body=event_body
+                    )
+                else:
+                    request = self.service.events().insert(
+                        calendarId=self.calendar_id,
+                        body=event_body
+                    )
+                batch.add(request, request_id=str(i))
+                queued += 1
+
+            if not queued:
+                continue
+
+            try:
+                await self._execute(batch)
+            except Exception as e:
+                logger.error(f"Failed to execute Google Calendar batch: {e}")
+                continue
+
+            for i, event in enumerate(chunk):
+                response = responses.get(str(i))
+                if response is None:
+                    continue
+
+                event.calendar_event_id = response.get('id', event.calendar_event_id)
+                event.calendar_url = response.get('htmlLink', event.calendar_url)
+                await event.save(update_fields=['calendar_event_id', 'calendar_url'])
+                synced += 1
+
+        logger.info(f"Synced {synced}/{len(events)} events to Google Calendar in batches")
+        return synced
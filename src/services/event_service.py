@@ -74,16 +74,37 @@ class EventService(Service):
             timezone=event.timezone
         )
 
-    async def get_user_events(self, user_id: int, active_only: bool = True) -> List[Event]:
-        """Get all events for a user."""
-        try:
-            query = Event.filter(creator_user_id=user_id)
+    def _user_events_query(self, user_id: int, active_only: bool):
+        query = Event.filter(creator_user_id=user_id)
+        if active_only:
+            query = query.filter(is_completed=False, is_cancelled=False)
+        return query
 
-            if active_only:
-                query = query.filter(is_completed=False, is_cancelled=False)
+    async def get_user_events(
+        self,
+        user_id: int,
+        active_only: bool = True,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[Event]:
+        """Get events for a user, optionally a single page of them."""
+        try:
+            query = self._user_events_query(user_id, active_only).order_by('event_datetime')
+            if offset:
+                query = query.offset(offset)
+            if limit is not None:
+                query = query.limit(limit)
 
-            return await query.order_by('event_datetime').all()
+            return await query
 
         except Exception as e:
             logger.error(f"Failed to get events for user {user_id}: {e}")
             raise DatabaseError(f"Could not retrieve events: {e}")
+
+    async def count_user_events(self, user_id: int, active_only: bool = True) -> int:
+        try:
+            return await self._user_events_query(user_id, active_only).count()
+
+        except Exception as e:
+            logger.error(f"Failed to count events for user {user_id}: {e}")
+            raise DatabaseError(f"Could not count events: {e}")
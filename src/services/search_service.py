@@ -1,9 +1,12 @@
+import asyncio
 import base64
+import random
 import time
-from typing import Dict, Generator, List, Optional
+from collections import OrderedDict
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
 
 from ..config.settings import settings
 from ..utils.logger import setup_logger
@@ -11,6 +14,14 @@ from .service import Service
 
 logger = setup_logger(__name__)
 
+# Search results often repeat the same top pages, so extracted text is kept for a while
+PAGE_CACHE_TTL = 600.0
+PAGE_CACHE_MAXSIZE = 256
+PAGE_CACHE_MAX_CHARS = 100_000
+
+# Only result items are built into the tree when parsing the SERP
+_SERP_ITEMS = SoupStrainer(['li', 'div'], class_=lambda c: c and ('serp-item' in c or 'organic' in c))
+
 
 class SearchService(Service):
 
@@ -18,40 +29,66 @@ class SearchService(Service):
         super().__init__(logger)
         self.timeout = 30
         self.max_attempts = 20
-        self.poll_interval = 5
-
-    def search_docs(
+        # Operations usually finish within seconds: poll early, then back off
+        self.base_poll_interval = 0.5
+        self.max_poll_interval = 5.0
+        self.max_concurrent_fetches = 5
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._page_cache: OrderedDict[str, Tuple[float, str]] = OrderedDict()
+
+    async def initialize(self):
+        await super().initialize()
+        # One pooled session keeps connections to the Yandex API and fetched sites alive
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=50, ttl_dns_cache=300, keepalive_timeout=60)
+        )
+
+    async def stop(self):
+        await super().stop()
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def search_docs(
         self,
         query: str,
         num_results: int = 5,
         fetch_full_content: bool = True
-    ) -> Generator[Dict[str, str], None, None]:
+    ) -> AsyncGenerator[Dict[str, str], None]:
         self.logger.info(f"Starting search for: {query}")
 
-        search_results = self._search_yandex(query, num_results)
+        search_results = await self._search_yandex(query, num_results)
 
         if not search_results:
             self.logger.warning("No search results found")
             return
 
-        for result in search_results:
-            url = result['url']
-            title = result['title']
-            snippet = result['snippet']
+        if not fetch_full_content:
+            for result in search_results:
+                yield {"content": result['snippet']}
+            return
 
-            if fetch_full_content:
-                self.logger.info(f"Fetching content from: {url}")
-                content = self._fetch_page_content(url)
+        # Pages are fetched concurrently and yielded as soon as each one is ready
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
 
-                if content:
-                    yield {"content": content}
-                else:
-                    self.logger.warning(f"Could not fetch content from {url}, using snippet")
-                    yield {"content": snippet}
-            else:
-                yield {"content": snippet}
+        async def fetch(result: Dict[str, str]) -> str:
+            async with semaphore:
+                content = await self._fetch_page_content(result['url'])
+            if not content:
+                self.logger.warning(f"Could not fetch content from {result['url']}, using snippet")
+                return result['snippet']
+            return content
+
+        tasks = [asyncio.create_task(fetch(result)) for result in search_results]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield {"content": await next_done}
+        finally:
+            for task in tasks:
+                task.cancel()
 
-    def _search_yandex(self, query: str, num_results: int = 5) -> List[Dict[str, str]]:
+    async def _search_yandex(self, query: str, num_results: int = 5) -> List[Dict[str, str]]:
         """ Поиск через Yandex API """
         if not settings.yandex_folder_id or not settings.yandex_api_key:
             self.logger.warning("Yandex API credentials not found")
@@ -76,10 +113,9 @@ class SearchService(Service):
             }
 
             self.logger.info(f"Starting async search for: {query}")
-            response = requests.post(search_url, headers=headers, json=body, timeout=self.timeout)
-            response.raise_for_status()
-
-            operation_data = response.json()
+            async with self._session.post(search_url, headers=headers, json=body) as response:
+                response.raise_for_status()
+                operation_data = await response.json()
             operation_id = operation_data.get('id')
 
             if not operation_id:
@@ -88,14 +124,14 @@ class SearchService(Service):
 
             self.logger.info(f"Operation ID: {operation_id}, waiting for results...")
 
-            results = self._poll_search_operation(operation_id, headers, num_results)
+            results = await self._poll_search_operation(operation_id, headers, num_results)
             return results if results else []
 
         except Exception as e:
             self.logger.warning(f"Yandex Search API error: {e}")
             return []
 
-    def _poll_search_operation(
+    async def _poll_search_operation(
         self,
         operation_id: str,
         headers: Dict[str, str],
@@ -105,15 +141,17 @@ class SearchService(Service):
         attempt = 0
 
         while attempt < self.max_attempts:
-            time.sleep(self.poll_interval)
+            if attempt:
+                delay = min(self.max_poll_interval, self.base_poll_interval * (1.7 ** attempt))
+                await asyncio.sleep(delay + random.uniform(0, 0.25))
             attempt += 1
 
             self.logger.debug(f"Checking operation status, attempt {attempt}/{self.max_attempts}")
 
             try:
-                op_response = requests.get(operation_url, headers=headers, timeout=self.timeout)
-                op_response.raise_for_status()
-                op_data = op_response.json()
+                async with self._session.get(operation_url, headers=headers) as op_response:
+                    op_response.raise_for_status()
+                    op_data = await op_response.json()
 
                 if op_data.get('done'):
                     self.logger.info("Operation completed successfully")
@@ -138,7 +176,7 @@ class SearchService(Service):
         raw_data = op_data['response']['rawData']
         html_result = base64.b64decode(raw_data).decode('utf-8')
 
-        soup = BeautifulSoup(html_result, 'html.parser')
+        soup = BeautifulSoup(html_result, 'lxml', parse_only=_SERP_ITEMS)
         results = []
 
         search_items = soup.find_all('li', class_='serp-item')
@@ -183,13 +221,38 @@ class SearchService(Service):
         self.logger.info(f"Found {len(results)} results from Yandex Search API")
         return results
 
-    def _fetch_page_content(self, url: str) -> Optional[str]:
+    def _get_cached_page(self, url: str) -> Optional[str]:
+        cached = self._page_cache.get(url)
+        if cached is None:
+            return None
+        if time.monotonic() - cached[0] >= PAGE_CACHE_TTL:
+            del self._page_cache[url]
+            return None
+        self._page_cache.move_to_end(url)
+        return cached[1]
+
+    def _cache_page(self, url: str, text: str) -> None:
+        if len(text) > PAGE_CACHE_MAX_CHARS:
+            return
+        self._page_cache[url] = (time.monotonic(), text)
+        self._page_cache.move_to_end(url)
+        while len(self._page_cache) > PAGE_CACHE_MAXSIZE:
+            self._page_cache.popitem(last=False)
+
+    async def _fetch_page_content(self, url: str) -> Optional[str]:
+        cached = self._get_cached_page(url)
+        if cached is not None:
+            self.logger.info(f"Using cached content for: {url}")
+            return cached
+
         try:
+            self.logger.info(f"Fetching content from: {url}")
             headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-            response = requests.get(url, timeout=self.timeout, headers=headers)
-            response.raise_for_status()
+            async with self._session.get(url, headers=headers) as response:
+                response.raise_for_status()
+                html = await response.text(errors="replace")
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
 
             for element in soup(['script', 'style', 'nav', 'footer', 'header', 'aside']):
                 element.decompose()
@@ -200,6 +263,7 @@ class SearchService(Service):
             chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
             text = ' '.join(chunk for chunk in chunks if chunk)
 
+            self._cache_page(url, text)
             return text
 
         except Exception as e:
@@ -1,5 +1,6 @@
+import time
 from datetime import datetime
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Tuple
 
 from .service import Service
 from ..models import UserSettings
@@ -9,12 +10,52 @@ from ..utils.helpers import parse_reminder_time
 
 logger = setup_logger(__name__)
 
+# Settings change only through the /set_* commands, which invalidate the cache
+SETTINGS_CACHE_TTL = 60.0
+
+_SETTINGS_TEMPLATE = """
+⚙️ **Ваши настройки**
+
+🔔 **Напоминания по умолчанию:** {reminders}
+🌍 **Часовой пояс:** {timezone}
+📅 **Формат даты:** {date_format}
+🎂 **День рождения:** {birthday}
+
+🔕 **Уведомления:**
+• Напоминания: {reminder_icon}
+• Уведомления о завершении: {completion_icon}
+
+Используйте кнопки ниже для изменения настроек.
+"""
+_TOGGLE_ICONS = ("❌ Отключены", "✅ Включены")
+
+
+def _format_minutes(minutes: int) -> str:
+    if minutes < 60:
+        return f"{minutes}м"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}ч"
+    hours, mins = divmod(minutes, 60)
+    return f"{hours}ч {mins}м"
+
+
+# Labels for the commonly used reminder offsets
+_MINUTES_LABELS = {
+    minutes: _format_minutes(minutes)
+    for minutes in (5, 10, 15, 30, 60, 120, 180, 360, 720, 1440, 2880, 10080)
+}
+
 
 class UserSettingsService(Service):
     def __init__(self):
         super().__init__(logger)
+        self._settings_cache: Dict[int, Tuple[float, UserSettings]] = {}
 
     async def get_user_settings(self, user_id: int) -> UserSettings:
+        cached = self._settings_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] < SETTINGS_CACHE_TTL:
+            return cached[1]
+
         defaults = {
             'timezone': settings.timezone,
             'default_reminder_times': self._normalize_reminder_values(
@@ -39,8 +80,13 @@ class UserSettingsService(Service):
             user_settings.default_reminder_times = normalized_current
             await user_settings.save(update_fields=["default_reminder_times"])
 
+        self._settings_cache[user_id] = (time.monotonic(), user_settings)
         return user_settings
 
+    def _invalidate_owner_settings(self) -> None:
+        # Updates mutate the cached instance, so drop it even when save() fails
+        self._settings_cache.pop(settings.owner_user_id, None)
+
     async def get_owner_settings(self) -> UserSettings:
         return await self.get_user_settings(settings.owner_user_id)
 
@@ -50,7 +96,10 @@ class UserSettingsService(Service):
 
         if birthday_text.lower() in {"", "clear", "reset"}:
             owner_settings.birthday = None
-            await owner_settings.save(update_fields=["birthday"])
+            try:
+                await owner_settings.save(update_fields=["birthday"])
+            finally:
+                self._invalidate_owner_settings()
             return owner_settings
 
         try:
@@ -59,14 +108,20 @@ class UserSettingsService(Service):
             raise ValueError("Используйте формат YYYY-MM-DD (например, 1990-05-17)") from exc
 
         owner_settings.birthday = birthday_date
-        await owner_settings.save(update_fields=["birthday"])
+        try:
+            await owner_settings.save(update_fields=["birthday"])
+        finally:
+            self._invalidate_owner_settings()
         return owner_settings
 
     async def update_owner_default_reminders(self, reminder_text: str) -> UserSettings:
         reminders = self._parse_reminder_input(reminder_text)
         owner_settings = await self.get_owner_settings()
         owner_settings.default_reminder_times = reminders
-        await owner_settings.save(update_fields=["default_reminder_times"])
+        try:
+            await owner_settings.save(update_fields=["default_reminder_times"])
+        finally:
+            self._invalidate_owner_settings()
         return owner_settings
 
     async def update_owner_date_format(self, date_format: str) -> UserSettings:
@@ -76,7 +131,10 @@ class UserSettingsService(Service):
 
         owner_settings = await self.get_owner_settings()
         owner_settings.date_format = date_format
-        await owner_settings.save(update_fields=["date_format"])
+        try:
+            await owner_settings.save(update_fields=["date_format"])
+        finally:
+            self._invalidate_owner_settings()
         return owner_settings
 
     def generate_user_settings_text(self, user_settings: UserSettings) -> str:
@@ -89,21 +147,14 @@ class UserSettingsService(Service):
         # last_sync = "Никогда"
         # if user_settings.last_calendar_sync:
         #     last_sync = user_settings.last_calendar_sync.strftime("%Y-%m-%d %H:%M")
-        settings_text = f"""
-⚙️ **Ваши настройки**
-
-🔔 **Напоминания по умолчанию:** {', '.join(reminder_times) if reminder_times else "Не заданы"}
-🌍 **Часовой пояс:** {user_settings.timezone}
-📅 **Формат даты:** {user_settings.date_format}
-🎂 **День рождения:** {birthday_text}
-
-🔕 **Уведомления:**
-• Напоминания: {"✅ Включены" if user_settings.reminder_notifications else "❌ Отключены"}
-• Уведомления о завершении: {"✅ Включены" if user_settings.completion_notifications else "❌ Отключены"}
-
-Используйте кнопки ниже для изменения настроек.
-"""
-        return settings_text
+        return _SETTINGS_TEMPLATE.format_map({
+            "reminders": ", ".join(reminder_times) if reminder_times else "Не заданы",
+            "timezone": user_settings.timezone,
+            "date_format": user_settings.date_format,
+            "birthday": birthday_text,
+            "reminder_icon": _TOGGLE_ICONS[bool(user_settings.reminder_notifications)],
+            "completion_icon": _TOGGLE_ICONS[bool(user_settings.completion_notifications)],
+        })
 
     def _normalize_reminder_values(
         self,
@@ -152,14 +203,7 @@ class UserSettingsService(Service):
 
         normalized = self._normalize_reminder_values(reminder_values, allow_empty=True)
         for minutes in normalized:
-            if minutes < 60:
-                formatted.append(f"{minutes}м")
-            elif minutes % 60 == 0:
-                hours = minutes // 60
-                formatted.append(f"{hours}ч")
-            else:
-                hours, mins = divmod(minutes, 60)
-                formatted.append(f"{hours}ч {mins}м")
+            formatted.append(_MINUTES_LABELS.get(minutes) or _format_minutes(minutes))
         return formatted
 
     def format_reminder_times(self, reminder_values: Iterable) -> List[str]:
@@ -1,16 +1,22 @@
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List
-import pytz
 
 from ..config.settings import settings
 from .logger import setup_logger
+from .timezones import UTC, tz
 
 logger = setup_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _owners() -> frozenset:
+    return frozenset({settings.owner_user_id})
+
+
 def is_owner(user_id: int) -> bool:
-    return user_id == settings.owner_user_id
+    return user_id in _owners()
 
 
 def extract_chat_info(chat) -> tuple[int, str, str]:
@@ -47,12 +53,12 @@ def format_event_message(
     """Format event message for Telegram."""
     # Convert to local timezone for display
     timezone_name = timezone or settings.timezone
-    local_tz = pytz.timezone(timezone_name)
+    local_tz = tz(timezone_name)
 
     # Convert event datetime to local timezone
     if event_datetime.tzinfo is None:
         # Assume UTC if naive
-        event_datetime = pytz.UTC.localize(event_datetime)
+        event_datetime = event_datetime.replace(tzinfo=UTC)
     local_event_datetime = event_datetime.astimezone(local_tz)
 
     # Convert end datetime to local timezone if provided
@@ -60,7 +66,7 @@ def format_event_message(
     if end_datetime:
         if end_datetime.tzinfo is None:
             # Assume UTC if naive
-            end_datetime = pytz.UTC.localize(end_datetime)
+            end_datetime = end_datetime.replace(tzinfo=UTC)
         local_end_datetime = end_datetime.astimezone(local_tz)
 
     # Header
@@ -145,8 +151,7 @@ def format_time_remaining(target_datetime: datetime) -> str:
     # Ensure both datetimes are timezone-aware or naive
     if target_datetime.tzinfo is not None and now.tzinfo is None:
         # Convert naive now to UTC timezone
-        import pytz
-        now = pytz.UTC.localize(now)
+        now = now.replace(tzinfo=UTC)
     elif target_datetime.tzinfo is None and now.tzinfo is not None:
         # Convert timezone-aware now to naive
         now = now.replace(tzinfo=None)
@@ -0,0 +1,11 @@
+from datetime import timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+UTC = timezone.utc
+
+
+@lru_cache(maxsize=512)
+def tz(name: str) -> tzinfo:
+    """Cached zone lookup; zone objects are immutable so sharing them is safe."""
+    return ZoneInfo(name)